@@ -1,13 +1,26 @@
 """Alpha Copilot Social Agent."""
 
+from importlib import import_module
+from typing import Any
+
 from .config import Config
 from .eval import PostEvaluator
-from .llm import LLMClient, LLMResponse
-from .loop import AgentLoop, create_agent, EvaluationFailedError
-from .retry import retry_with_backoff
+from .retry import aretry_with_backoff, retry_with_backoff
+
+# Resolved on first access so importing agent.config (e.g. from platforms/)
+# does not load the google-genai SDK
+_LAZY_IMPORTS = {
+    "AgentLoop": ".loop",
+    "create_agent": ".loop",
+    "EvaluationFailedError": ".loop",
+    "run_many": ".loop",
+    "LLMClient": ".llm",
+    "LLMResponse": ".llm",
+}
 
 __all__ = [
     "AgentLoop",
+    "aretry_with_backoff",
     "Config",
     "create_agent",
     "EvaluationFailedError",
@@ -15,4 +28,14 @@ __all__ = [
     "LLMResponse",
     "PostEvaluator",
     "retry_with_backoff",
+    "run_many",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
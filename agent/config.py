@@ -2,63 +2,99 @@
 
 import os
 from contextlib import contextmanager
-from typing import Any, Dict, Iterator
+from typing import Any, Dict, FrozenSet, Iterator
 from dotenv import load_dotenv
 
-# Load .env first, then .env.local overrides
-load_dotenv()
-load_dotenv(".env.local", override=True)
+
+def _load_env_files() -> None:
+    """Load .env first, then .env.local overrides.
+
+    Container deploys inject the environment directly and can set
+    SKIP_DOTENV=true to skip the dotenv file search entirely.
+    """
+    if os.environ.get("SKIP_DOTENV", "").lower() == "true":
+        return
+    load_dotenv()
+    if os.path.isfile(".env.local"):
+        load_dotenv(".env.local", override=True)
+
+
+_load_env_files()
+
+# Snapshot the environment once; Config reads plain dict lookups from here
+_ENV: Dict[str, str] = os.environ.copy()
+
+
+def _env_bool(key: str, default: str) -> bool:
+    """Read a boolean flag from the environment ("true"/"false")."""
+    return _ENV.get(key, default).lower() == "true"
+
+
+def _env_int(key: str, default: str) -> int:
+    """Read an integer setting from the environment."""
+    return int(_ENV.get(key, default))
 
 
 class Config:
     """Agent configuration loaded from environment variables."""
 
     # Alpha Copilot Backend API
-    ALPHA_COPILOT_API_URL: str = os.getenv(
+    ALPHA_COPILOT_API_URL: str = _ENV.get(
         "ALPHA_COPILOT_API_URL",
         "http://localhost:8002"
     )
-    ALPHA_COPILOT_API_KEY: str = os.getenv("ALPHA_COPILOT_API_KEY", "")
+    ALPHA_COPILOT_API_KEY: str = _ENV.get("ALPHA_COPILOT_API_KEY", "")
 
     # Supabase Authentication (same flow as frontend)
-    SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
-    SUPABASE_ANON_KEY: str = os.getenv("SUPABASE_ANON_KEY", "")
-    SUPABASE_EMAIL: str = os.getenv("SUPABASE_EMAIL", "")
-    SUPABASE_PASSWORD: str = os.getenv("SUPABASE_PASSWORD", "")
+    SUPABASE_URL: str = _ENV.get("SUPABASE_URL", "")
+    SUPABASE_ANON_KEY: str = _ENV.get("SUPABASE_ANON_KEY", "")
+    SUPABASE_EMAIL: str = _ENV.get("SUPABASE_EMAIL", "")
+    SUPABASE_PASSWORD: str = _ENV.get("SUPABASE_PASSWORD", "")
 
     # LLM Configuration
-    GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
-    LLM_MODEL: str = os.getenv("LLM_MODEL", "gemini-3-flash-preview")
-    LLM_TIMEOUT: int = int(os.getenv("LLM_TIMEOUT", "60"))
-    ENABLE_GROUNDING: bool = os.getenv("ENABLE_GROUNDING", "true").lower() == "true"
+    GEMINI_API_KEY: str = _ENV.get("GEMINI_API_KEY", "")
+    LLM_MODEL: str = _ENV.get("LLM_MODEL", "gemini-3-flash-preview")
+    LLM_TIMEOUT: int = _env_int("LLM_TIMEOUT", "60")
+    LLM_RETRY_DEADLINE: int = _env_int("LLM_RETRY_DEADLINE", "120")  # Seconds across all retries
+    LLM_NATIVE_TOOLS: bool = _env_bool("LLM_NATIVE_TOOLS", "false")  # Gemini function calling
+    LLM_STREAM: bool = _env_bool("LLM_STREAM", "false")  # Stop reading once a tool call is complete
+    LLM_CANDIDATES: int = _env_int("LLM_CANDIDATES", "1")  # Replies sampled per call; best tool call wins
+    ENABLE_GROUNDING: bool = _env_bool("ENABLE_GROUNDING", "true")
 
     # Twitter/X Credentials
-    TWITTER_API_KEY: str = os.getenv("TWITTER_API_KEY", "")
-    TWITTER_API_SECRET: str = os.getenv("TWITTER_API_SECRET", "")
-    TWITTER_ACCESS_TOKEN: str = os.getenv("TWITTER_ACCESS_TOKEN", "")
-    TWITTER_ACCESS_SECRET: str = os.getenv("TWITTER_ACCESS_SECRET", "")
-    TWITTER_BEARER_TOKEN: str = os.getenv("TWITTER_BEARER_TOKEN", "")
+    TWITTER_API_KEY: str = _ENV.get("TWITTER_API_KEY", "")
+    TWITTER_API_SECRET: str = _ENV.get("TWITTER_API_SECRET", "")
+    TWITTER_ACCESS_TOKEN: str = _ENV.get("TWITTER_ACCESS_TOKEN", "")
+    TWITTER_ACCESS_SECRET: str = _ENV.get("TWITTER_ACCESS_SECRET", "")
+    TWITTER_BEARER_TOKEN: str = _ENV.get("TWITTER_BEARER_TOKEN", "")
 
     # Threads Credentials (Meta Graph API)
-    THREADS_ACCESS_TOKEN: str = os.getenv("THREADS_ACCESS_TOKEN", "")
-    THREADS_USER_ID: str = os.getenv("THREADS_USER_ID", "")
+    THREADS_ACCESS_TOKEN: str = _ENV.get("THREADS_ACCESS_TOKEN", "")
+    THREADS_USER_ID: str = _ENV.get("THREADS_USER_ID", "")
 
     # Alpha Copilot Promotional Settings
-    ALPHA_COPILOT_URL: str = os.getenv(
+    ALPHA_COPILOT_URL: str = _ENV.get(
         "ALPHA_COPILOT_URL",
         "https://alphacopilot.ai"
     )
-    ENABLE_PROMO_POST: bool = os.getenv("ENABLE_PROMO_POST", "true").lower() == "true"
+    ENABLE_PROMO_POST: bool = _env_bool("ENABLE_PROMO_POST", "true")
 
     # Agent Settings
-    MAX_ITERATIONS: int = int(os.getenv("MAX_ITERATIONS", "10"))
-    DRY_RUN: bool = os.getenv("DRY_RUN", "true").lower() == "true"
+    MAX_ITERATIONS: int = _env_int("MAX_ITERATIONS", "10")
+    # Recent messages re-sent each turn. An iteration adds at most two, so with
+    # the defaults (2 x MAX_ITERATIONS) history is never trimmed; lower it, or
+    # raise MAX_ITERATIONS, to bound prompt growth on long runs
+    HISTORY_WINDOW: int = _env_int("HISTORY_WINDOW", "20")
+    DRY_RUN: bool = _env_bool("DRY_RUN", "true")
 
     # Evaluation Thresholds
-    EVAL_HOOKINESS_MIN: int = int(os.getenv("EVAL_HOOKINESS_MIN", "15"))  # 15/25 = 60%
-    EVAL_QUALITY_MIN: int = int(os.getenv("EVAL_QUALITY_MIN", "30"))      # 30/50 = 60%
-    EVAL_TOTAL_MIN: int = int(os.getenv("EVAL_TOTAL_MIN", "45"))          # 45/75 = 60%
-    EVAL_MODE: str = os.getenv("EVAL_MODE", "both")  # hookiness|quality|both
+    EVAL_HOOKINESS_MIN: int = _env_int("EVAL_HOOKINESS_MIN", "15")  # 15/25 = 60%
+    EVAL_QUALITY_MIN: int = _env_int("EVAL_QUALITY_MIN", "30")      # 30/50 = 60%
+    EVAL_TOTAL_MIN: int = _env_int("EVAL_TOTAL_MIN", "45")          # 45/75 = 60%
+    EVAL_MODE: str = _ENV.get("EVAL_MODE", "both")  # hookiness|quality|both
+
+    # Names of the settings above, populated after the class body
+    _CONFIG_KEYS: FrozenSet[str]
 
     @classmethod
     def validate_llm(cls) -> bool:
@@ -120,12 +156,10 @@ class Config:
                 run_agent()
             # Original values are restored
         """
-        original: Dict[str, Any] = {}
         for key in kwargs:
-            if hasattr(cls, key):
-                original[key] = getattr(cls, key)
-            else:
+            if key not in cls._CONFIG_KEYS:
                 raise ValueError(f"Unknown config key: {key}")
+        original: Dict[str, Any] = {key: getattr(cls, key) for key in kwargs}
 
         try:
             for key, value in kwargs.items():
@@ -134,3 +168,9 @@ class Config:
         finally:
             for key, value in original.items():
                 setattr(cls, key, value)
+
+
+Config._CONFIG_KEYS = frozenset(
+    key for key, value in vars(Config).items()
+    if key.isupper() and not callable(value)
+)
@@ -1,16 +1,224 @@
 """Unified evaluation system for post quality."""
 
 import re
+import sys
 import logging
 from dataclasses import dataclass
-from typing import Tuple
+from functools import lru_cache
+from typing import Callable, FrozenSet, List, Optional, Pattern, Tuple, Union
+
+import re2
 
 from agent.config import Config
 
 logger = logging.getLogger(__name__)
 
+EVAL_CACHE_SIZE = 512
+
+# Score records are immutable; slots need Python 3.10+
+_SCORE_DATACLASS = {'frozen': True, **({'slots': True} if sys.version_info >= (3, 10) else {})}
+
+
+def _fuse(**cues: str) -> Pattern[str]:
+    """Compile named cue patterns into one alternation with a group per cue."""
+    return re.compile(
+        '|'.join(f'(?P<{name}>{p})' for name, p in cues.items()),
+        re.IGNORECASE,
+    )
+
+
+def _compile_bridge(pattern: str) -> Pattern[str]:
+    """
+    Compile a case-insensitive pattern that bridges cues with '.*'.
+
+    Backtracking makes these quadratic on long text, so they use re2 (linear
+    time). re2 treats \\b as ASCII-only, unlike re, next to non-ASCII letters.
+    """
+    return re2.compile('(?i)' + pattern)
+
+
+def _found_cues(regex: Pattern[str], text: str) -> FrozenSet[str]:
+    """Names of the distinct cues of a fused pattern that occur in text."""
+    return frozenset(m.lastgroup for m in regex.finditer(text))
+
+
+def _category(*cues: Union[str, Tuple[str, ...]]) -> Tuple[FrozenSet[str], ...]:
+    """Describe a cue category; a tuple entry counts once if any of its cues match."""
+    return tuple(frozenset(c) if isinstance(c, tuple) else frozenset((c,)) for c in cues)
+
+
+def _count_category(found: FrozenSet[str], category: Tuple[FrozenSet[str], ...]) -> int:
+    """Count how many of a category's cues are among the found cue names."""
+    return sum(1 for names in category if not names.isdisjoint(found))
+
+
+# Word cues for news, urgency, human voice and news quality, compiled once at
+# import into a single alternation so shared cues (just, today, earnings, ...)
+# are matched once. No two cues can match overlapping text, so an earlier match
+# never hides another cue; "reports?" and "reported" are split for that reason.
+_CUE_RE = _fuse(
+    just=r'\bjust\b', today=r'\btoday\b', breaking=r'\bbreaking\b',
+    this_morning=r'\bthis morning\b', rally=r'\brally\b', reports=r'\breports?\b',
+    reported=r'\breported\b', earnings=r'\bearnings\b', demand=r'\bdemand\b',
+    surge=r'\bsurge\b', now=r'\bnow\b', this_week=r'\bthis week\b', expir=r'\bexpir',
+    weekly=r'\bweekly\b', before=r'\bbefore\b', take_it=r"I'll take it",
+    heres=r"\bhere's\b", how_to=r'\bhow to\b', if_you=r'\bif you\b', im=r"\bI'm\b",
+    everyone=r'\beveryone\b', thats=r"\bthat's\b", lets=r"\blet's\b", free=r'\bfree\b',
+    arrow=r'→', chart_rocket=r'📈|🚀', question=r'\?', exactly=r'\bexactly\b',
+    beat=r'\bbeat\b', miss=r'\bmiss\b', announced=r'\bannounced?\b', percent=r'\d+%',
+    all_time_high=r'all-time high',
+)
+_NEWS_CUES = _category(
+    'just', 'breaking', 'today', 'this_morning', 'rally', 'reports', 'earnings',
+    'demand', 'surge',
+)
+_URGENCY_CUES = _category(
+    'just', 'now', 'today', 'this_week', 'expir', 'weekly', 'before', 'take_it',
+)
+_HUMAN_CUES = _category(
+    'heres', 'how_to', 'if_you', 'im', 'everyone', 'thats', 'lets', 'free',
+    'arrow', 'chart_rocket', 'question', 'exactly',
+)
+_NEWS_QUALITY_CUES = _category(
+    'just', 'today', ('reports', 'reported'), 'earnings', 'beat', 'miss',
+    'announced', 'percent', 'all_time_high',
+)
+
+# Patterns that bridge with '.*' or overlap each other stay separate so a long
+# match can't hide another cue
+_NEWS_BRIDGE_PATTERNS = tuple(_compile_bridge(p) for p in (
+    r'\bhit\b.*\bhigh', r'\bup\b.*%', r'\bdown\b.*%',
+    r'\bafter\b.*\bmiss\b', r'\bbroke\b.*resistance'
+))
+_STRIKE_RE = re.compile(r'\$\d+')
+_PERCENT_RE = re.compile(r'\d+%')
+# Remaining specificity patterns; $ and % numbers are counted via the above
+_NUMBER_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'\d+\.\d+', r'Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec',
+    r'\d+/\d+', r'\d+ (days?|weeks?)'
+))
+_SCROLL_EMOJI = frozenset('📈🚀📊💰')
+# Originality also counts the arrow bullet
+_ORIGINALITY_EMOJI = _SCROLL_EMOJI | {'→'}
+
+# Thesis groups overlap the news cues (rally, surge), so they get their own pass
+_THESIS_RE = _fuse(
+    stance=r'\b(bullish|bearish|neutral)\b',
+    action=r'\b(buy|sell|hold)\b',
+    direction=r'\b(up|down|higher|lower)\b',
+    move=r'\b(rally|drop|surge|decline)\b',
+)
+_MONTH_RE = re.compile(r'Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec')
+_POP_RE = _compile_bridge(r'\d+%.*prob')
+_SCROLL_NEWS_RE = re.compile(r'\bjust\b|\btoday\b|\breport', re.IGNORECASE)
+
+# Score ladders indexed by match count; counts past the end use the last entry
+_NEWS_HOOK_SCORES = (1, 3, 4, 5)
+_SPECIFICITY_SCORES = (1, 2, 3, 4, 4, 5)
+_URGENCY_SCORES = (1, 3, 4, 5)
+_HUMAN_VOICE_SCORES = (1, 3, 4, 4, 5)
+_SCROLL_STOP_SCORES = (1, 1, 2, 3, 4, 5)
+_SCROLL_ESTIMATE_SCORES = (1, 2, 3, 4, 5)
+
+# Plain substring cues, checked against the lowercased post
+_PREMIUM_WORDS = ('premium', 'credit', 'collect')
+_STORY_WORDS = ("here's", 'everyone', "that's")
+
+
+@dataclass(**_SCORE_DATACLASS)
+class _PostFeatures:
+    """Signals extracted from a post once and shared by both scorers."""
+    lower: str
+    length: int
+    has_newline: bool
+    has_question: bool
+    pipe_count: int
+    has_emoji: bool  # 📈🚀📊💰
+    has_originality_emoji: bool  # Emoji set plus →
+    has_strike: bool  # $<number>
+    has_percent: bool  # <number>%
+    has_month: bool
+    has_pop: bool
+    has_scroll_news: bool
+    news_matches: int
+    num_matches: int
+    urgency_matches: int
+    human_matches: int
+    thesis_matches: int
+    news_quality_matches: int
+
+
+def _ladder(scores: Tuple[int, ...], count: int) -> int:
+    """Look up the score for a match count, saturating at the top rung."""
+    return scores[min(count, len(scores) - 1)]
+
+
+@lru_cache(maxsize=None)
+def _make_checker(eval_mode: str) -> Callable[..., Tuple[bool, str]]:
+    """
+    Build the threshold check for an eval mode.
+
+    Which sub-scores are gated is decided once per mode, and failure messages
+    are only formatted when a threshold actually trips.
+    """
+    gate_hookiness = eval_mode in ("hookiness", "both")
+    gate_quality = eval_mode in ("quality", "both")
+
+    def check(
+        hookiness_score: int, quality_score: int, total_score: int,
+        hookiness_min: int, quality_min: int, total_min: int,
+    ) -> Tuple[bool, str]:
+        hookiness_low = gate_hookiness and hookiness_score < hookiness_min
+        quality_low = gate_quality and quality_score < quality_min
+        total_low = total_score < total_min
+        if not (hookiness_low or quality_low or total_low):
+            return True, ""
 
-@dataclass
+        failures = []
+        if hookiness_low:
+            failures.append(f"Hookiness too low: {hookiness_score}/{hookiness_min} required")
+        if quality_low:
+            failures.append(f"Quality too low: {quality_score}/{quality_min} required")
+        if total_low:
+            failures.append(f"Total score too low: {total_score}/{total_min} required")
+        return False, " | ".join(failures)
+
+    return check
+
+
+def _featurize(post: str) -> _PostFeatures:
+    """Scan a post once for every signal the heuristic scorers use."""
+    has_strike = bool(_STRIKE_RE.search(post))
+    has_percent = bool(_PERCENT_RE.search(post))
+    emoji_found = _ORIGINALITY_EMOJI.intersection(post)
+    cues = _found_cues(_CUE_RE, post)
+    return _PostFeatures(
+        lower=post.lower(),
+        length=len(post),
+        has_newline='\n' in post,
+        has_question='?' in post,
+        pipe_count=post.count('|'),
+        has_emoji=not _SCROLL_EMOJI.isdisjoint(emoji_found),
+        has_originality_emoji=bool(emoji_found),
+        has_strike=has_strike,
+        has_percent=has_percent,
+        has_month=bool(_MONTH_RE.search(post)),
+        has_pop=bool(_POP_RE.search(post)),
+        has_scroll_news=bool(_SCROLL_NEWS_RE.search(post)),
+        news_matches=_count_category(cues, _NEWS_CUES) + sum(
+            1 for p in _NEWS_BRIDGE_PATTERNS if p.search(post)
+        ),
+        num_matches=has_strike + has_percent + sum(
+            1 for p in _NUMBER_PATTERNS if p.search(post)
+        ),
+        urgency_matches=_count_category(cues, _URGENCY_CUES),
+        human_matches=_count_category(cues, _HUMAN_CUES),
+        thesis_matches=len(_found_cues(_THESIS_RE, post)),
+        news_quality_matches=_count_category(cues, _NEWS_QUALITY_CUES),
+    )
+
+
+@dataclass(**_SCORE_DATACLASS)
 class HookinessScore:
     """Hookiness scores for engagement potential."""
     post: str
@@ -23,7 +231,7 @@ class HookinessScore:
     reasoning: str  # Why the scores were given
 
 
-@dataclass
+@dataclass(**_SCORE_DATACLASS)
 class QualityScore:
     """Content quality scores (thesis-driven analysis)."""
     thesis_clarity: int  # 1-10: Clear investment thesis?
@@ -35,7 +243,7 @@ class QualityScore:
     reasoning: str
 
 
-@dataclass
+@dataclass(**_SCORE_DATACLASS)
 class UnifiedScore:
     """Combined hookiness + quality evaluation."""
     hookiness: HookinessScore
@@ -53,26 +261,60 @@ class PostEvaluator:
         self.quality_min = Config.EVAL_QUALITY_MIN
         self.total_min = Config.EVAL_TOTAL_MIN
         self.eval_mode = Config.EVAL_MODE
+        # Rewrites and retries often re-submit identical text
+        self._evaluate_cached = lru_cache(maxsize=EVAL_CACHE_SIZE)(self._evaluate)
 
     def evaluate(self, post_text: str) -> UnifiedScore:
         """
         Evaluate a post using both hookiness and quality metrics.
 
+        Results are memoized per evaluator, keyed on the post text and the
+        current thresholds. Treat the returned score as read-only.
+
         Args:
             post_text: The complete post text
 
         Returns:
             UnifiedScore with pass/fail and detailed breakdown
         """
+        return self._evaluate_cached(
+            post_text, self.eval_mode, self.hookiness_min, self.quality_min, self.total_min
+        )
+
+    def batch_evaluate(self, posts: List[str]) -> List[UnifiedScore]:
+        """
+        Evaluate several candidate posts, e.g. to rank rewrites.
+
+        Args:
+            posts: Post texts to score
+
+        Returns:
+            One UnifiedScore per post, in input order
+        """
+        return [self.evaluate(post) for post in posts]
+
+    def cache_clear(self) -> None:
+        """Drop memoized evaluation results."""
+        self._evaluate_cached.cache_clear()
+
+    def _evaluate(
+        self, post_text: str, eval_mode: str, hookiness_min: int, quality_min: int, total_min: int
+    ) -> UnifiedScore:
+        """Uncached evaluate() against explicit thresholds."""
+        features = _featurize(post_text)
+
         # 1. Score hookiness (engagement metrics)
-        hookiness = self._score_hookiness_heuristic(post_text)
+        hookiness = self._score_hookiness_heuristic(post_text, features)
 
         # 2. Score quality (content metrics)
-        quality = self._score_quality_heuristic(post_text)
+        quality = self._score_quality_heuristic(post_text, features)
 
         # 3. Determine pass/fail
         total = hookiness.total + quality.total
-        passed, reason = self._check_thresholds(hookiness.total, quality.total, total)
+        check = _make_checker(eval_mode)
+        passed, reason = check(
+            hookiness.total, quality.total, total, hookiness_min, quality_min, total_min
+        )
 
         return UnifiedScore(
             hookiness=hookiness,
@@ -82,97 +324,44 @@ class PostEvaluator:
             failure_reason=reason
         )
 
-    def _score_hookiness_heuristic(self, post: str) -> HookinessScore:
+    def _score_hookiness_heuristic(
+        self, post: str, features: Optional[_PostFeatures] = None
+    ) -> HookinessScore:
         """Score post hookiness using heuristic rules."""
+        if features is None:
+            features = _featurize(post)
 
         # NEWS_HOOK: Check for news indicators
-        news_patterns = [
-            r'\bjust\b', r'\bbreaking\b', r'\btoday\b', r'\bthis morning\b',
-            r'\bhit\b.*\bhigh', r'\bup\b.*%', r'\bdown\b.*%', r'\brally\b',
-            r'\breports?\b', r'\bearnings\b', r'\bafter\b.*\bmiss\b',
-            r'\bdemand\b', r'\bsurge\b', r'\bbroke\b.*resistance'
-        ]
-        news_hook = 1
-        news_matches = sum(1 for p in news_patterns if re.search(p, post, re.IGNORECASE))
-        if news_matches >= 3:
-            news_hook = 5
-        elif news_matches >= 2:
-            news_hook = 4
-        elif news_matches >= 1:
-            news_hook = 3
+        news_matches = features.news_matches
+        news_hook = _ladder(_NEWS_HOOK_SCORES, news_matches)
 
         # SPECIFICITY: Check for specific numbers
-        number_patterns = [
-            r'\$\d+', r'\d+%', r'\d+\.\d+', r'Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec',
-            r'\d+/\d+', r'\d+ (days?|weeks?)'
-        ]
-        specificity = 1
-        num_matches = sum(1 for p in number_patterns if re.search(p, post, re.IGNORECASE))
-        if num_matches >= 5:
-            specificity = 5
-        elif num_matches >= 3:
-            specificity = 4
-        elif num_matches >= 2:
-            specificity = 3
-        elif num_matches >= 1:
-            specificity = 2
+        num_matches = features.num_matches
+        specificity = _ladder(_SPECIFICITY_SCORES, num_matches)
 
         # URGENCY: Check for urgency indicators
-        urgency_patterns = [
-            r'\bjust\b', r'\bnow\b', r'\btoday\b', r'\bthis week\b',
-            r'\bexpir', r'\bweekly\b', r'\bbefore\b', r"I'll take it"
-        ]
-        urgency = 1
-        urgency_matches = sum(1 for p in urgency_patterns if re.search(p, post, re.IGNORECASE))
-        if urgency_matches >= 3:
-            urgency = 5
-        elif urgency_matches >= 2:
-            urgency = 4
-        elif urgency_matches >= 1:
-            urgency = 3
+        urgency_matches = features.urgency_matches
+        urgency = _ladder(_URGENCY_SCORES, urgency_matches)
 
         # HUMAN_VOICE: Check for conversational elements
-        human_patterns = [
-            r'\bhere\'s\b', r'\bhow to\b', r'\bif you\b', r'\bI\'m\b',
-            r'\beveryone\b', r'\bthat\'s\b', r'\blet\'s\b', r'\bfree\b',
-            r'→', r'📈|🚀', r'\?', r'\bexactly\b'
-        ]
-        human_voice = 1
-        human_matches = sum(1 for p in human_patterns if re.search(p, post, re.IGNORECASE))
+        human_matches = features.human_matches
+        human_voice = _ladder(_HUMAN_VOICE_SCORES, human_matches)
         # Also penalize template-like structure
-        template_penalty = 1 if '|' in post and post.count('|') >= 3 else 0
-        human_voice = min(5, max(1, human_matches - template_penalty))
-        if human_matches >= 4:
-            human_voice = 5
-        elif human_matches >= 2:
-            human_voice = 4
-        elif human_matches >= 1:
-            human_voice = 3
+        template_penalty = 1 if features.pipe_count >= 3 else 0
         if template_penalty:
             human_voice = max(1, human_voice - 2)
 
         # SCROLL_STOP: Combination of above + length and structure
-        has_line_breaks = '\n' in post
-        has_emoji = bool(re.search(r'[📈🚀📊💰]', post))
-
-        scroll_stop = 1
         scroll_factors = sum([
             news_hook >= 3,
             specificity >= 3,
             urgency >= 3,
             human_voice >= 3,
-            has_line_breaks,
-            has_emoji,
-            len(post) > 100,
+            features.has_newline,
+            features.has_emoji,
+            features.length > 100,
         ])
-        if scroll_factors >= 5:
-            scroll_stop = 5
-        elif scroll_factors >= 4:
-            scroll_stop = 4
-        elif scroll_factors >= 3:
-            scroll_stop = 3
-        elif scroll_factors >= 2:
-            scroll_stop = 2
+        scroll_stop = _ladder(_SCROLL_STOP_SCORES, scroll_factors)
 
         total = news_hook + specificity + urgency + human_voice + scroll_stop
 
@@ -189,53 +378,45 @@ class PostEvaluator:
             reasoning=reasoning
         )
 
-    def _score_quality_heuristic(self, post: str) -> QualityScore:
+    def _score_quality_heuristic(
+        self, post: str, features: Optional[_PostFeatures] = None
+    ) -> QualityScore:
         """Score post quality using heuristic rules."""
+        if features is None:
+            features = _featurize(post)
+        low = features.lower
 
         # THESIS_CLARITY: Check for clear directional view
-        thesis_indicators = [
-            r'\b(bullish|bearish|neutral)\b',
-            r'\b(buy|sell|hold)\b',
-            r'\b(up|down|higher|lower)\b',
-            r'\b(rally|drop|surge|decline)\b'
-        ]
-        thesis_clarity = self._pattern_score(post, thesis_indicators, scale=10)
+        thesis_clarity = self._pattern_score(
+            features.thesis_matches, len(_THESIS_RE.groupindex), scale=10
+        )
 
         # NEWS_DRIVEN: Check for news/event references
-        news_indicators = [
-            r'\bjust\b', r'\btoday\b', r'\breport(s|ed)?\b',
-            r'\bearnings\b', r'\bbeat\b', r'\bmiss\b',
-            r'\bannounced?\b', r'\d+%', r'all-time high'
-        ]
-        news_driven = self._pattern_score(post, news_indicators, scale=10)
+        news_driven = self._pattern_score(
+            features.news_quality_matches, len(_NEWS_QUALITY_CUES), scale=10
+        )
 
         # ACTIONABLE: Check for specific trade details
-        has_strike = bool(re.search(r'\$\d+', post))
-        has_date = bool(re.search(r'Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec', post))
-        has_premium = bool(re.search(r'premium|credit|collect', post, re.I))
-        has_pop = bool(re.search(r'\d+%.*prob', post, re.I))
+        has_strike = features.has_strike
+        has_date = features.has_month
+        has_premium = any(w in low for w in _PREMIUM_WORDS)
+        has_pop = features.has_pop
 
-        actionable = sum([has_strike * 3, has_date * 3, has_premium * 2, has_pop * 2])
-        actionable = min(10, actionable)
+        actionable = min(10, 3 * has_strike + 3 * has_date + 2 * has_premium + 2 * has_pop)
 
         # ENGAGEMENT: Similar to hookiness scroll_stop
         # Use scroll_stop as base and scale
-        scroll_stop_score = self._get_scroll_stop_estimate(post)
+        scroll_stop_score = self._get_scroll_stop_estimate(features)
         engagement = min(10, scroll_stop_score * 2)  # Scale from 5 to 10
 
         # ORIGINALITY: Penalty for templates, reward for unique phrasing
-        has_template = '|' in post and post.count('|') >= 3
-        has_emoji = bool(re.search(r'[📈🚀📊💰→]', post))
-        has_question = '?' in post
-        has_story = any(w in post.lower() for w in ['here\'s', 'everyone', 'that\'s'])
-
-        originality = 5  # baseline
-        if has_template:
-            originality -= 3
-        if has_emoji:
-            originality += 2
-        if has_question or has_story:
-            originality += 2
+        has_template = features.pipe_count >= 3
+        has_emoji = features.has_originality_emoji
+        has_question = features.has_question
+        has_story = any(w in low for w in _STORY_WORDS)
+
+        # Baseline 5, -3 for template structure, +2 each for emoji and question/story
+        originality = 5 - 3 * has_template + 2 * has_emoji + 2 * (has_question or has_story)
         originality = max(1, min(10, originality))
 
         total = thesis_clarity + news_driven + actionable + engagement + originality
@@ -250,69 +431,25 @@ class PostEvaluator:
             reasoning=f"Quality heuristic: thesis={thesis_clarity}, news={news_driven}, actionable={actionable}"
         )
 
-    def _pattern_score(self, text: str, patterns: list, scale: int = 10) -> int:
-        """Score based on pattern matches."""
-        matches = sum(1 for p in patterns if re.search(p, text, re.I))
+    def _pattern_score(self, matches: int, num_patterns: int, scale: int = 10) -> int:
+        """Score based on how many of num_patterns cues matched."""
         # Scale linearly: 0 matches=1, max matches=scale
         if not matches:
             return 1
-        max_expected = len(patterns) // 2  # Expect ~half
+        max_expected = num_patterns // 2  # Expect ~half
         score = 1 + min(matches, max_expected) * (scale - 1) // max_expected
         return min(scale, score)
 
-    def _get_scroll_stop_estimate(self, post: str) -> int:
+    def _get_scroll_stop_estimate(self, features: _PostFeatures) -> int:
         """Estimate scroll-stop score (1-5) for quality scoring."""
-        has_line_breaks = '\n' in post
-        has_emoji = bool(re.search(r'[📈🚀📊💰]', post))
-        has_news = bool(re.search(r'\bjust\b|\btoday\b|\breport', post, re.I))
-        has_numbers = bool(re.search(r'\d+%|\$\d+', post))
-
         scroll_factors = sum([
-            has_news,
-            has_numbers,
-            has_line_breaks,
-            has_emoji,
-            len(post) > 100,
+            features.has_scroll_news,
+            features.has_strike or features.has_percent,
+            features.has_newline,
+            features.has_emoji,
+            features.length > 100,
         ])
-
-        if scroll_factors >= 4:
-            return 5
-        elif scroll_factors >= 3:
-            return 4
-        elif scroll_factors >= 2:
-            return 3
-        elif scroll_factors >= 1:
-            return 2
-        else:
-            return 1
-
-    def _check_thresholds(
-        self, hookiness_score: int, quality_score: int, total_score: int
-    ) -> Tuple[bool, str]:
-        """Check if scores meet thresholds."""
-        failures = []
-
-        if self.eval_mode in ["hookiness", "both"]:
-            if hookiness_score < self.hookiness_min:
-                failures.append(
-                    f"Hookiness too low: {hookiness_score}/{self.hookiness_min} required"
-                )
-
-        if self.eval_mode in ["quality", "both"]:
-            if quality_score < self.quality_min:
-                failures.append(
-                    f"Quality too low: {quality_score}/{self.quality_min} required"
-                )
-
-        if total_score < self.total_min:
-            failures.append(
-                f"Total score too low: {total_score}/{self.total_min} required"
-            )
-
-        if failures:
-            return False, " | ".join(failures)
-
-        return True, ""
+        return _ladder(_SCROLL_ESTIMATE_SCORES, scroll_factors)
 
     def format_report(self, score: UnifiedScore) -> str:
         """Format evaluation report for logging."""
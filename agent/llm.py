@@ -1,22 +1,184 @@
 """LLM client for the agent using google-genai package."""
 
+import asyncio
+import io
 import json
 import logging
 import re
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import sys
+import threading
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, replace
 
 from google import genai
 from google.genai import types
 from google.genai.errors import ServerError
 
 from .config import Config
-from .retry import retry_with_backoff
+from .retry import aretry_with_backoff, retry_with_backoff
 
 logger = logging.getLogger(__name__)
 
+# ```json fence or a bare "json" label line, up to the object's opening brace
+_JSON_LABEL_RE = re.compile(r'(?:```|^)json\s*(?=\{)', re.MULTILINE)
+# Opening of an inline tool-call object, e.g. {"tool": ...} or { "tool" : ...}
+_TOOL_START_RE = re.compile(r'\{\s*"tool"\s*:')
+
+_DECODER = json.JSONDecoder()
+
+# Fixed prompt text around the tool list
+_TOOL_CALLING_FORMAT = (
+    "\n## Tool Calling Format\n\n"
+    "To call a tool, respond with JSON in this exact format:\n"
+    "```json\n"
+    '{"tool": "tool_name", "arguments": {"arg1": "value1"}}\n'
+    "```\n"
+    "\nAvailable tools:\n\n"
+)
+_TOOL_CALL_REMINDER = (
+    "\nIMPORTANT: Always respond with a tool call JSON block. Do not just describe what you would do.\n"
+    "\n---\n\n"
+)
+
+# (name, description, ((param, type, description, required), ...)) per tool
+ToolsKey = Tuple[Tuple[str, str, Tuple[Tuple[str, str, str, bool], ...]], ...]
+
+
+def _new_genai_client(api_key: str, timeout: int) -> genai.Client:
+    """Create a genai.Client with the given per-request timeout in seconds."""
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(timeout=timeout * 1000),  # Milliseconds
+    )
+
+
+@lru_cache(maxsize=4)
+def get_genai_client(api_key: str, timeout: int) -> genai.Client:
+    """Return a shared genai.Client for the given API key and timeout.
+
+    The client owns its HTTP connection pool, so sharing one instance across
+    LLMClient and tools keeps connections alive and avoids repeated setup and
+    TLS handshakes. Use get_async_genai_client() for async calls.
+
+    Args:
+        api_key: Gemini API key
+        timeout: Per-request timeout in seconds
+    """
+    return _new_genai_client(api_key, timeout)
+
+
+# Async clients by (event loop, api_key, timeout)
+_ASYNC_CLIENTS: Dict[Tuple[asyncio.AbstractEventLoop, str, int], genai.Client] = {}
+_ASYNC_CLIENTS_LOCK = threading.Lock()
+
+
+def get_async_genai_client(api_key: str, timeout: int) -> genai.Client:
+    """Return the genai.Client to use for client.aio calls on the running loop.
+
+    The async transport pools connections bound to the event loop that opened
+    them, so reusing one client across loops (each asyncio.run(), or eval
+    worker threads) fails with "Event loop is closed". Each loop gets its own
+    client, reused for as long as the loop runs; call
+    close_async_genai_clients() before the loop shuts down.
+    """
+    loop = asyncio.get_running_loop()
+    key = (loop, api_key, timeout)
+    with _ASYNC_CLIENTS_LOCK:
+        client = _ASYNC_CLIENTS.get(key)
+        if client is None:
+            stale = [k for k in _ASYNC_CLIENTS if k[0].is_closed()]
+            if stale:
+                # Their transports can no longer be closed; just release them
+                logger.warning("Dropping %d genai clients whose event loop closed before them", len(stale))
+                for k in stale:
+                    del _ASYNC_CLIENTS[k]
+            client = _ASYNC_CLIENTS[key] = _new_genai_client(api_key, timeout)
+    return client
+
+
+async def close_async_genai_clients() -> None:
+    """Close and forget the genai clients opened on the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _ASYNC_CLIENTS_LOCK:
+        clients = [_ASYNC_CLIENTS.pop(k) for k in [k for k in _ASYNC_CLIENTS if k[0] is loop]]
+    for client in clients:
+        await client.aio.aclose()
+
+
+def _tools_key(tools: List[Dict[str, Any]]) -> ToolsKey:
+    """Reduce tool schemas to the hashable fields the prompt renders."""
+    key = []
+    for tool in tools:
+        params = tool.get("parameters", {}).get("properties", {})
+        required = tool.get("parameters", {}).get("required", [])
+        key.append((
+            tool["name"],
+            tool["description"],
+            tuple(
+                (pname, pinfo.get("type", "string"), pinfo.get("description", ""), pname in required)
+                for pname, pinfo in params.items()
+            ),
+        ))
+    return tuple(key)
+
+
+@lru_cache(maxsize=8)
+def _render_prompt_prefix(system: Optional[str], tools: ToolsKey) -> str:
+    """Render the system message, tool calling format and tool list.
+
+    This part of the prompt is identical on every turn of a run, so it is
+    rendered once and reused; only the conversation history changes.
+    """
+    buf = io.StringIO()
+
+    if system is not None:
+        buf.write(f"{system}\n")
+
+    buf.write(_TOOL_CALLING_FORMAT)
+
+    for name, desc, params in tools:
+        buf.write(f"- **{name}**: {desc}\n")
+        if params:
+            buf.write("  Parameters:\n")
+        for pname, ptype, pdesc, is_required in params:
+            req = "(required)" if is_required else "(optional)"
+            buf.write(f"    - {pname} ({ptype}) {req}: {pdesc}\n")
+        buf.write("\n")
+
+    buf.write(_TOOL_CALL_REMINDER)
+    return buf.getvalue()
 
-@dataclass
+
+def _is_tool_call(data: Any) -> bool:
+    """Whether a decoded JSON value is a tool-call object with a non-empty name."""
+    return isinstance(data, dict) and isinstance(data.get("tool"), str) and bool(data["tool"])
+
+
+def _decode_leading_call(text: str) -> Optional[Dict[str, Any]]:
+    """Decode a reply that is exactly one (optionally ```json fenced) tool call.
+
+    Returns None if the reply has any other shape or is still incomplete.
+    """
+    stripped = text.strip()
+    if stripped.startswith("{"):
+        candidate = stripped
+    elif stripped.startswith("```json"):
+        end = stripped.find("```", 7)
+        if end < 0:
+            return None
+        candidate = stripped[7:end]
+    else:
+        return None
+
+    try:
+        data = _DECODER.decode(candidate)
+    except json.JSONDecodeError:
+        return None
+    return data if _is_tool_call(data) else None
+
+
+@dataclass(frozen=True, **({'slots': True} if sys.version_info >= (3, 10) else {}))
 class LLMResponse:
     """Structured response from LLM."""
     reasoning: str
@@ -45,9 +207,20 @@ class LLMClient:
         if not Config.GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY not configured")
 
-        self.client = genai.Client(api_key=Config.GEMINI_API_KEY)
+        self.client = get_genai_client(Config.GEMINI_API_KEY, Config.LLM_TIMEOUT)
         self.model_name = Config.LLM_MODEL
         self.enable_grounding = enable_grounding
+        self.native_tools = Config.LLM_NATIVE_TOOLS
+        self.candidate_count = 1 if self.native_tools else Config.LLM_CANDIDATES
+        self.stream = Config.LLM_STREAM and not self.native_tools and self.candidate_count == 1
+        # Generation settings are fixed, so build the request config once
+        self._gen_config = types.GenerateContentConfig(
+            temperature=0.7,
+            max_output_tokens=2048,  # Increased to avoid truncation on long posts
+            candidate_count=self.candidate_count if self.candidate_count > 1 else None,
+        )
+        # (schemas, config with their function declarations) for native mode
+        self._native_config: Optional[Tuple[List[Dict[str, Any]], types.GenerateContentConfig]] = None
 
         # Configure grounding tool if enabled
         if enable_grounding:
@@ -77,173 +250,291 @@ class LLMClient:
         Raises:
             Exception: If LLM generation fails
         """
-        # Build prompt with tool instructions
-        prompt = self._build_prompt_with_tools(messages, tools)
-
-        # Configure generation
-        config = types.GenerateContentConfig(
-            temperature=0.7,
-            max_output_tokens=2048,  # Increased to avoid truncation on long posts
-        )
+        prompt, config = self._prepare_request(messages, tools)
 
         def _do_generate():
             """Inner function for retry wrapper."""
+            if self.stream:
+                return self._generate_streaming(prompt, config)
+
             response = self.client.models.generate_content(
                 model=self.model_name,
                 contents=prompt,
                 config=config,
             )
+            return self._handle_response(response, tools)
 
-            # Extract text from response
-            response_text = response.text if hasattr(response, 'text') and response.text else str(response)
+        # Use retry utility for transient server errors
+        return retry_with_backoff(
+            func=_do_generate,
+            retryable_exceptions=ServerError,
+            operation_name="Gemini LLM generation",
+            deadline=Config.LLM_RETRY_DEADLINE,
+        )
 
-            # Ensure response_text is a string
-            if not isinstance(response_text, str):
-                response_text = str(response_text)
+    async def agenerate(
+        self,
+        messages: List[Dict[str, str]],
+        tools: List[Dict[str, Any]]
+    ) -> LLMResponse:
+        """
+        Async variant of generate().
 
-            # Extract grounding sources if available
-            grounding_sources = self._extract_grounding_sources(response)
-            if grounding_sources:
-                logger.info(f"Grounding sources used: {len(grounding_sources)}")
+        Uses the SDK's native async client (one per event loop, see
+        get_async_genai_client) and asyncio-based retries, so concurrent agents
+        overlap their Gemini round-trips without a thread each.
 
-            parsed = self._parse_response(response_text)
-            parsed.grounding_sources = grounding_sources
-            return parsed
+        Raises:
+            Exception: If LLM generation fails
+        """
+        if self.stream:
+            # The early-stopping stream reader is synchronous; keep it off the loop
+            return await asyncio.to_thread(self.generate, messages, tools)
 
-        # Use retry utility for transient server errors
-        return retry_with_backoff(
+        prompt, config = self._prepare_request(messages, tools)
+
+        aio = get_async_genai_client(Config.GEMINI_API_KEY, Config.LLM_TIMEOUT).aio
+
+        async def _do_generate():
+            """Inner coroutine for retry wrapper."""
+            response = await aio.models.generate_content(
+                model=self.model_name,
+                contents=prompt,
+                config=config,
+            )
+            return self._handle_response(response, tools)
+
+        return await aretry_with_backoff(
             func=_do_generate,
             retryable_exceptions=ServerError,
             operation_name="Gemini LLM generation",
+            deadline=Config.LLM_RETRY_DEADLINE,
         )
 
+    def _prepare_request(
+        self,
+        messages: List[Dict[str, str]],
+        tools: List[Dict[str, Any]]
+    ) -> Tuple[str, types.GenerateContentConfig]:
+        """Build the prompt and pick the generation config for this call."""
+        if self.native_tools:
+            # Tools travel as function declarations; the prompt is just the conversation
+            return self._build_native_prompt(messages), self._get_native_config(tools)
+        # Build prompt with tool instructions
+        return self._build_prompt_with_tools(messages, tools), self._gen_config
+
+    def _handle_response(self, response, tools: List[Dict[str, Any]]) -> LLMResponse:
+        """Turn a complete generate_content response into an LLMResponse."""
+        if self.native_tools:
+            parsed = self._parse_function_call(response)
+            if parsed is not None:
+                return parsed
+
+        if self.candidate_count > 1:
+            parsed = self._select_candidate(response, tools)
+            grounding_sources = self._extract_grounding_sources(response)
+            return replace(parsed, grounding_sources=grounding_sources)
+
+        # Extract text from response
+        response_text = response.text if hasattr(response, 'text') and response.text else str(response)
+
+        # Ensure response_text is a string
+        if not isinstance(response_text, str):
+            response_text = str(response_text)
+
+        # Report how much of the shared prompt prefix Gemini served from cache
+        usage = getattr(response, 'usage_metadata', None)
+        if usage:
+            logger.debug(
+                f"LLM prompt tokens: {getattr(usage, 'prompt_token_count', None)}, "
+                f"cached: {getattr(usage, 'cached_content_token_count', None) or 0}"
+            )
+
+        # Extract grounding sources if available
+        grounding_sources = self._extract_grounding_sources(response)
+        if grounding_sources:
+            logger.info(f"Grounding sources used: {len(grounding_sources)}")
+
+        parsed = self._parse_response(response_text)
+        return replace(parsed, grounding_sources=grounding_sources)
+
+    def _generate_streaming(self, prompt: str, config: types.GenerateContentConfig) -> LLMResponse:
+        """Stream the reply and stop as soon as it opens with a complete tool call.
+
+        Tool-call replies are a single JSON block, so anything the model writes
+        after it is discarded anyway; closing the stream early saves the wait
+        and output tokens. Grounding sources are taken from the chunks read.
+        """
+        buf = io.StringIO()
+        grounding_sources: List[str] = []
+        stream = self.client.models.generate_content_stream(
+            model=self.model_name,
+            contents=prompt,
+            config=config,
+        )
+        try:
+            for chunk in stream:
+                grounding_sources.extend(self._extract_grounding_sources(chunk) or ())
+                text = chunk.text
+                if not text:
+                    continue
+                buf.write(text)
+                data = _decode_leading_call(buf.getvalue())
+                if data is not None:
+                    logger.debug("Complete tool call received; closing stream early")
+                    return replace(
+                        self._tool_call_response(buf.getvalue(), data),
+                        grounding_sources=grounding_sources or None,
+                    )
+        finally:
+            stream.close()
+
+        parsed = self._parse_response(buf.getvalue())
+        return replace(parsed, grounding_sources=grounding_sources or None)
+
     def _build_prompt_with_tools(
         self,
         messages: List[Dict[str, str]],
         tools: List[Dict[str, Any]]
     ) -> str:
-        """Build prompt with tool descriptions and calling format."""
-        parts = []
-
-        # Add system message first
-        for msg in messages:
-            if msg["role"] == "system":
-                parts.append(msg["content"])
-                break
-
-        # Add tool instructions
-        parts.append("\n## Tool Calling Format\n")
-        parts.append("To call a tool, respond with JSON in this exact format:")
-        parts.append("```json")
-        parts.append('{"tool": "tool_name", "arguments": {"arg1": "value1"}}')
-        parts.append("```")
-        parts.append("\nAvailable tools:\n")
-
-        for tool in tools:
-            name = tool["name"]
-            desc = tool["description"]
-            params = tool.get("parameters", {}).get("properties", {})
-            required = tool.get("parameters", {}).get("required", [])
-
-            param_strs = []
-            for pname, pinfo in params.items():
-                req = "(required)" if pname in required else "(optional)"
-                ptype = pinfo.get("type", "string")
-                pdesc = pinfo.get("description", "")
-                param_strs.append(f"    - {pname} ({ptype}) {req}: {pdesc}")
-
-            parts.append(f"- **{name}**: {desc}")
-            if param_strs:
-                parts.append("  Parameters:")
-                parts.extend(param_strs)
-            parts.append("")
-
-        parts.append("\nIMPORTANT: Always respond with a tool call JSON block. Do not just describe what you would do.")
-        parts.append("\n---\n")
-
-        # Add conversation history
-        for msg in messages:
+        """Build prompt with tool descriptions and calling format.
+
+        The invariant prefix comes first and the per-turn history last, so
+        consecutive requests share a byte-identical prefix that Gemini's
+        implicit context caching can reuse.
+        """
+        system, history = self._split_system(messages)
+        return _render_prompt_prefix(system, _tools_key(tools)) + self._render_history(history)
+
+    def _build_native_prompt(self, messages: List[Dict[str, str]]) -> str:
+        """Build prompt for native function calling (no tool instructions)."""
+        system, history = self._split_system(messages)
+        prefix = f"{system}\n\n---\n\n" if system is not None else ""
+        return prefix + self._render_history(history)
+
+    def _split_system(
+        self,
+        messages: List[Dict[str, str]]
+    ) -> Tuple[Optional[str], List[Dict[str, str]]]:
+        """Separate the system message from the conversation history."""
+        if messages and messages[0]["role"] == "system":
+            return messages[0]["content"], messages[1:]
+        system = next((m["content"] for m in messages if m["role"] == "system"), None)
+        return system, [m for m in messages if m["role"] != "system"]
+
+    def _render_history(self, history: List[Dict[str, str]]) -> str:
+        """Conversation history (without system messages) and the assistant cue."""
+        buf = io.StringIO()
+
+        for msg in history:
             role = msg["role"]
             content = msg["content"]
 
-            if role == "system":
-                continue  # Already added
-            elif role == "user":
-                parts.append(f"USER: {content}\n")
+            if role == "user":
+                buf.write(f"USER: {content}\n\n")
             elif role == "assistant":
-                parts.append(f"ASSISTANT: {content}\n")
+                buf.write(f"ASSISTANT: {content}\n\n")
             elif role == "tool":
-                parts.append(f"TOOL RESULT:\n{content}\n")
+                buf.write(f"TOOL RESULT:\n{content}\n\n")
+
+        buf.write("\nASSISTANT: ")
+
+        return buf.getvalue()
+
+    def _get_native_config(self, tools: List[Dict[str, Any]]) -> types.GenerateContentConfig:
+        """Config declaring the tools as functions, reused while the schema list is unchanged."""
+        if self._native_config is None or self._native_config[0] is not tools:
+            declarations = [
+                types.FunctionDeclaration(
+                    name=tool["name"],
+                    description=tool["description"],
+                    parameters_json_schema=tool.get("parameters"),
+                )
+                for tool in tools
+            ]
+            config = self._gen_config.model_copy(update={
+                "tools": [types.Tool(function_declarations=declarations)],
+                "automatic_function_calling": types.AutomaticFunctionCallingConfig(disable=True),
+            })
+            self._native_config = (tools, config)
+        return self._native_config[1]
+
+    def _parse_function_call(self, response) -> Optional[LLMResponse]:
+        """Build an LLMResponse from a native function call, if the model made one.
+
+        Returns None when the reply has no function call, so the caller can
+        fall back to parsing the text.
+        """
+        calls = getattr(response, 'function_calls', None)
+        if not calls:
+            return None
 
-        parts.append("\nASSISTANT: ")
+        call = calls[0]
+        content = response.candidates[0].content
+        reasoning = "".join(part.text for part in content.parts if part.text)
 
-        return "\n".join(parts)
+        grounding_sources = self._extract_grounding_sources(response)
+        return LLMResponse(
+            reasoning=reasoning,
+            tool_call={"name": call.name, "arguments": dict(call.args or {})},
+            is_done=(call.name == "done"),
+            grounding_sources=grounding_sources,
+        )
 
-    def _parse_response(self, text: str) -> LLMResponse:
-        """Parse LLM response to extract tool call."""
-        # Look for JSON block with triple backticks
-        json_match = re.search(r'```json\s*(.*?)\s*```', text, re.DOTALL)
+    def _select_candidate(self, response, tools: List[Dict[str, Any]]) -> LLMResponse:
+        """Parse every sampled candidate and keep the most usable one.
 
-        # Also try without backticks: "json\n{...}" format
-        if not json_match:
-            json_match = re.search(r'^json\s*(\{.*?\})\s*$', text, re.DOTALL | re.MULTILINE)
+        Prefers a tool call over prose, and a call to a registered tool over an
+        unknown one; ties go to the earliest candidate.
+        """
+        known = {tool["name"] for tool in tools}
+        best = None
+        best_rank = (False, False)
+        for candidate in getattr(response, 'candidates', None) or ():
+            content = getattr(candidate, 'content', None)
+            parts = getattr(content, 'parts', None) or ()
+            parsed = self._parse_response("".join(part.text for part in parts if part.text))
+            call = parsed.tool_call
+            rank = (call is not None, call is not None and call["name"] in known)
+            if best is None or rank > best_rank:
+                best, best_rank = parsed, rank
+
+        if best is None:
+            raise ValueError("Gemini returned no candidates")
+        return best
 
-        # Also try to match just "json" on one line followed by JSON on next lines
-        if not json_match:
-            json_match = re.search(r'\bjson\b\s*(\{"tool".*?\})\s*(?:```|$)', text, re.DOTALL)
+    def _parse_response(self, text: str) -> LLMResponse:
+        """Parse LLM response to extract tool call."""
+        # Every tool call carries a "tool" key; plain prose skips the regexes
+        if '"tool"' not in text:
+            return LLMResponse(reasoning=text, tool_call=None, is_done=False)
+
+        # Fast path: the prompt asks for a fenced (or bare) JSON object, so
+        # most replies decode directly without any regex scan
+        data = _decode_leading_call(text)
+        if data is not None:
+            return self._tool_call_response(text, data)
+
+        # A ```json fence (or "json" label line) after some prose: decode
+        # from the brace it introduces
+        label = _JSON_LABEL_RE.search(text)
+        if label:
+            try:
+                data, _ = _DECODER.raw_decode(text, label.end())
+            except json.JSONDecodeError:
+                data = None
+            if _is_tool_call(data):
+                return self._tool_call_response(text, data)
 
-        if json_match:
+        # Try to find inline JSON: decode from each tool-call opening brace;
+        # raw_decode balances braces in C and ignores any trailing text
+        for match in _TOOL_START_RE.finditer(text):
             try:
-                data = json.loads(json_match.group(1))
-                tool_name = data.get("tool")
-                arguments = data.get("arguments", {})
-
-                if tool_name:
-                    return LLMResponse(
-                        reasoning=text,
-                        tool_call={
-                            "name": tool_name,
-                            "arguments": arguments
-                        },
-                        is_done=(tool_name == "done")
-                    )
+                data, _ = _DECODER.raw_decode(text, match.start())
             except json.JSONDecodeError:
-                pass
-
-        # Try to find inline JSON
-        json_patterns = [
-            r'\{"tool":\s*"([^"]+)".*?\}',
-            r'\{\s*"tool"\s*:\s*"([^"]+)"',
-        ]
-
-        for pattern in json_patterns:
-            match = re.search(pattern, text)
-            if match:
-                # Try to extract the full JSON
-                try:
-                    # Find the start of the JSON
-                    start = text.find('{"tool"')
-                    if start >= 0:
-                        # Find matching closing brace
-                        depth = 0
-                        for i, c in enumerate(text[start:]):
-                            if c == '{':
-                                depth += 1
-                            elif c == '}':
-                                depth -= 1
-                                if depth == 0:
-                                    json_str = text[start:start + i + 1]
-                                    data = json.loads(json_str)
-                                    return LLMResponse(
-                                        reasoning=text,
-                                        tool_call={
-                                            "name": data.get("tool"),
-                                            "arguments": data.get("arguments", {})
-                                        },
-                                        is_done=(data.get("tool") == "done")
-                                    )
-                except (json.JSONDecodeError, ValueError):
-                    pass
+                continue
+            if _is_tool_call(data):
+                return self._tool_call_response(text, data)
 
         # No tool call found
         return LLMResponse(
@@ -252,27 +543,41 @@ class LLMClient:
             is_done=False
         )
 
+    def _tool_call_response(self, text: str, data: Dict[str, Any]) -> LLMResponse:
+        """Build the LLMResponse for a decoded tool-call object."""
+        tool_name = data.get("tool")
+        return LLMResponse(
+            reasoning=text,
+            tool_call={
+                "name": tool_name,
+                "arguments": data.get("arguments", {})
+            },
+            is_done=(tool_name == "done")
+        )
+
     def _extract_grounding_sources(self, response) -> Optional[List[str]]:
         """Extract grounding sources from response metadata."""
         sources = []
         try:
             # Check for grounding metadata in candidates
-            if hasattr(response, 'candidates') and response.candidates:
-                for candidate in response.candidates:
-                    if hasattr(candidate, 'grounding_metadata') and candidate.grounding_metadata:
-                        metadata = candidate.grounding_metadata
-                        # Extract from grounding_chunks
-                        if hasattr(metadata, 'grounding_chunks') and metadata.grounding_chunks:
-                            for chunk in metadata.grounding_chunks:
-                                if hasattr(chunk, 'web') and chunk.web:
-                                    uri = getattr(chunk.web, 'uri', None)
-                                    title = getattr(chunk.web, 'title', None)
-                                    if uri:
-                                        sources.append(f"{title}: {uri}" if title else uri)
-                        # Log search queries used
-                        if hasattr(metadata, 'web_search_queries') and metadata.web_search_queries:
-                            logger.debug(f"Search queries: {metadata.web_search_queries}")
-        except Exception as e:
+            for candidate in getattr(response, 'candidates', None) or ():
+                metadata = getattr(candidate, 'grounding_metadata', None)
+                if not metadata:
+                    continue
+                # Extract from grounding_chunks
+                for chunk in getattr(metadata, 'grounding_chunks', None) or ():
+                    web = getattr(chunk, 'web', None)
+                    if not web:
+                        continue
+                    uri = getattr(web, 'uri', None)
+                    title = getattr(web, 'title', None)
+                    if uri:
+                        sources.append(f"{title}: {uri}" if title else uri)
+                # Log search queries used
+                queries = getattr(metadata, 'web_search_queries', None)
+                if queries:
+                    logger.debug(f"Search queries: {queries}")
+        except AttributeError as e:
             # Log but don't fail - grounding metadata extraction is non-critical
             logger.debug(f"Could not extract grounding sources: {e}")
 
@@ -1,16 +1,40 @@
 """Main agent loop implementation."""
 
+import asyncio
+import json
 import logging
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 
-from .llm import LLMClient, LLMResponse
+from .llm import LLMClient, LLMResponse, close_async_genai_clients
 from .config import Config
 from .eval import PostEvaluator
 from tools.registry import ToolRegistry
+from tools.alpha_copilot import QueryAlphaCopilotTool
+from tools.write import WritePostTool
+from tools.market_news import GetMarketNewsTool
+from tools.publish import (
+    PublishTool,
+    CheckRecentPostsTool,
+    GetPlatformStatusTool,
+    CrossPostTool,
+    DoneTool,
+)
 from prompts.system import SYSTEM_PROMPT
 
 logger = logging.getLogger(__name__)
 
+# Convergence guard: stop once the model repeats itself or tools keep failing
+STUCK_REPEATS = 2       # Identical replies in a row after the first
+STUCK_TOOL_ERRORS = 3   # Consecutive failed tool calls
+
+# Opens the context note that replaces trimmed history
+_SUMMARY_PREFIX = "SUMMARY:"
+
+# Section markers in write_post results
+_POST_TEXT_MARKER = "POST TEXT:"
+_SUGGESTIONS_MARKER = "SUGGESTIONS:"
+
 
 class EvaluationFailedError(Exception):
     """Raised when post fails quality evaluation."""
@@ -35,11 +59,49 @@ class AgentLoop:
         self.evaluator = evaluator or PostEvaluator()
         self.max_iterations = Config.MAX_ITERATIONS
         self._pending_post = None  # Track post awaiting evaluation
+        self._pending_score = None  # Evaluation of _pending_post, once scored
+        self._dropped_tools: List[str] = []  # Tools called in turns trimmed from history
+
+    def reset(self) -> None:
+        """Clear per-run state so the agent can be reused for another task."""
+        self._pending_post = None
+        self._pending_score = None
+        self._dropped_tools = []
 
     def run(self, task: str) -> str:
         """
         Run the agent loop until task complete or max iterations.
 
+        Synchronous wrapper around arun(); must not be called from a running
+        event loop. Runs on a fresh event loop and closes that loop's async
+        clients before it ends.
+
+        Args:
+            task: The task description for the agent
+
+        Returns:
+            Final result or error message
+        """
+        return asyncio.run(self._arun_and_close(task))
+
+    async def _arun_and_close(self, task: str) -> str:
+        """Run arun() and then close the genai clients opened on this event loop.
+
+        For loops that end with the task; long-lived loops should keep their
+        clients and close them once, at shutdown.
+        """
+        try:
+            return await self.arun(task)
+        finally:
+            await close_async_genai_clients()
+
+    async def arun(self, task: str) -> str:
+        """
+        Async agent loop: LLM calls and tool execution are awaited so several
+        agents can overlap their network I/O (see run_many).
+
+        An AgentLoop tracks per-run state, so run one task per instance at a time.
+
         Args:
             task: The task description for the agent
 
@@ -49,21 +111,28 @@ class AgentLoop:
         logger.info(f"Starting agent loop for task: {task}")
 
         # Clear any pending post from previous runs
-        self._pending_post = None
+        self.reset()
 
         messages = [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": task}
         ]
 
+        # Schemas are fixed for the run; fetch them once rather than per call
+        tool_schemas = self.tools.get_schemas()
+
+        last_reply = None
+        repeats = 0
+        tool_errors = 0
+
         for iteration in range(1, self.max_iterations + 1):
             logger.info(f"Iteration {iteration}/{self.max_iterations}")
 
             try:
                 # 1. Get LLM response
-                response: LLMResponse = self.llm.generate(
+                response: LLMResponse = await self.llm.agenerate(
                     messages,
-                    tools=self.tools.get_schemas()
+                    tools=tool_schemas
                 )
 
                 logger.info(f"LLM reasoning: {response.reasoning[:100]}...")
@@ -71,13 +140,22 @@ class AgentLoop:
                 # 2. Check if done
                 if response.is_done and response.tool_call:
                     # Execute done tool to get summary
-                    result = self.tools.execute(
+                    result = await asyncio.to_thread(
+                        self.tools.execute,
                         response.tool_call["name"],
                         **response.tool_call["arguments"]
                     )
                     logger.info(f"Task complete: {result}")
                     return result
 
+                # Another call would most likely repeat this reply again
+                reply = self._reply_key(response)
+                repeats = repeats + 1 if reply is not None and reply == last_reply else 0
+                last_reply = reply
+                if repeats >= STUCK_REPEATS:
+                    logger.warning(f"Stopping: LLM repeated the same reply {repeats + 1} times")
+                    return "STUCK: The agent repeated the same response without making progress."
+
                 # 3. Execute tool if called
                 if response.tool_call:
                     tool_name = response.tool_call["name"]
@@ -86,7 +164,8 @@ class AgentLoop:
                     logger.info(f"Executing tool: {tool_name} with args: {tool_args}")
 
                     try:
-                        result = self.tools.execute(tool_name, **tool_args)
+                        # Tools do blocking HTTP; run them off the event loop
+                        result = await asyncio.to_thread(self.tools.execute, tool_name, **tool_args)
 
                         # Evaluation gate for write_post
                         if tool_name == "write_post" and "POST_READY" in result:
@@ -96,6 +175,7 @@ class AgentLoop:
                                 self._pending_post = post_text
 
                                 eval_result = self._evaluate_post(post_text)
+                                self._pending_score = eval_result
                                 if not eval_result.passed:
                                     # Evaluation failed - abort
                                     raise EvaluationFailedError(
@@ -108,6 +188,7 @@ class AgentLoop:
                                 result = result + f"\n\nEVAL_PASSED: Score {eval_result.total}/75"
 
                         logger.info(f"Tool result: {result[:200]}...")
+                        tool_errors = 0
                     except EvaluationFailedError as e:
                         # Evaluation failure - surface to user, don't retry
                         logger.error(f"Evaluation failed: {e}")
@@ -115,6 +196,10 @@ class AgentLoop:
                     except Exception as e:
                         result = f"TOOL_ERROR: {str(e)}"
                         logger.error(f"Tool execution failed: {e}")
+                        tool_errors += 1
+                        if tool_errors >= STUCK_TOOL_ERRORS:
+                            logger.warning(f"Stopping: {tool_errors} consecutive tool errors")
+                            return f"STUCK: {tool_errors} consecutive tool calls failed. Last error: {e}"
 
                     # 4. Add to context
                     messages.append({
@@ -139,25 +224,89 @@ class AgentLoop:
                     "content": f"ERROR: {str(e)}"
                 })
 
+            messages = self._compact(messages)
+
         # Max iterations reached
         logger.warning("Max iterations reached without completion")
         return "MAX_ITERATIONS_REACHED: The agent did not complete the task within the allowed iterations."
 
-    def _extract_post_text(self, tool_result: str) -> Optional[str]:
-        """Extract post text from write_post tool result."""
-        if "POST TEXT:" not in tool_result:
+    @staticmethod
+    def _reply_key(response: LLMResponse) -> Optional[Tuple[str, Optional[str], Optional[str]]]:
+        """Identify a reply by its reasoning and tool call, or None if it is empty.
+
+        Native function calls often come with no reasoning text, so the tool
+        call has to be part of the comparison.
+        """
+        call = response.tool_call
+        if not response.reasoning and not call:
             return None
+        if not call:
+            return response.reasoning, None, None
+        arguments = json.dumps(call.get("arguments") or {}, sort_keys=True, default=str)
+        return response.reasoning, call.get("name"), arguments
+
+    def _compact(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Keep the system and task messages plus the most recent whole turns.
+
+        Every iteration re-sends the whole history, so prompt tokens would
+        otherwise grow quadratically over a run. A turn is an assistant message
+        with the tool result that answers it (or a lone error/reasoning
+        message); turns are kept whole, newest first, up to HISTORY_WINDOW
+        messages. Trimmed turns are replaced by a single context note listing
+        the tools already called.
+        """
+        window = Config.HISTORY_WINDOW
+        head, body = messages[:2], messages[2:]
+        if body and body[0]["content"].startswith(_SUMMARY_PREFIX):
+            body = body[1:]
+        if window <= 0 or len(body) <= window:
+            return messages
+
+        # Split into turns: each assistant message starts a new one
+        turns: List[List[Dict[str, str]]] = []
+        for msg in body:
+            if msg["role"] == "assistant" or not turns:
+                turns.append([msg])
+            else:
+                turns[-1].append(msg)
+
+        # Newest turns first; the latest turn is always kept
+        kept_count = len(turns[-1])
+        first_kept = len(turns) - 1
+        while first_kept > 0 and kept_count + len(turns[first_kept - 1]) <= window:
+            first_kept -= 1
+            kept_count += len(turns[first_kept])
+
+        dropped = [msg for turn in turns[:first_kept] for msg in turn]
+        kept = [msg for turn in turns[first_kept:] for msg in turn]
+        for msg in dropped:
+            if msg["role"] == "assistant" and msg["content"].startswith("Called "):
+                self._dropped_tools.append(msg["content"][7:].split(":", 1)[0])
+
+        called = ", ".join(self._dropped_tools) or "none"
+        summary = {
+            "role": "user",
+            "content": f"{_SUMMARY_PREFIX} Earlier turns omitted. Tools already called: {called}",
+        }
+        logger.debug(f"Trimmed {len(dropped)} messages from history")
+        return head + [summary] + kept
 
-        parts = tool_result.split("POST TEXT:")
-        if len(parts) < 2:
+    def _extract_post_text(self, tool_result: str) -> Optional[str]:
+        """Extract post text from write_post tool result."""
+        start = tool_result.find(_POST_TEXT_MARKER)
+        if start < 0:
             return None
+        start += len(_POST_TEXT_MARKER)
 
         # Extract text between "POST TEXT:" and any warnings/suggestions
-        post_section = parts[1]
-        if "SUGGESTIONS:" in post_section:
-            post_section = post_section.split("SUGGESTIONS:")[0]
+        # (or a repeated marker)
+        end = len(tool_result)
+        for marker in (_POST_TEXT_MARKER, _SUGGESTIONS_MARKER):
+            found = tool_result.find(marker, start, end)
+            if found >= 0:
+                end = found
 
-        return post_section.strip()
+        return tool_result[start:end].strip()
 
     def _evaluate_post(self, post_text: str):
         """Evaluate post and log results."""
@@ -170,23 +319,13 @@ class AgentLoop:
         return score
 
 
-def create_agent() -> AgentLoop:
-    """Create and configure the agent with all tools."""
-    from tools.alpha_copilot import QueryAlphaCopilotTool
-    from tools.write import WritePostTool
-    from tools.market_news import GetMarketNewsTool
-    from tools.publish import (
-        PublishTool,
-        CheckRecentPostsTool,
-        GetPlatformStatusTool,
-        CrossPostTool,
-        DoneTool,
-    )
-
-    # Initialize LLM
-    llm = LLMClient()
-
-    # Initialize tool registry
+@lru_cache(maxsize=1)
+def build_tool_registry() -> ToolRegistry:
+    """Build the tool registry shared by every agent.
+
+    Tools hold only reusable clients (HTTP pools, platform connections), so
+    one set serves all agents; settings are read when it is first built.
+    """
     tools = ToolRegistry()
     tools.register(GetMarketNewsTool())  # Get LIVE news via Google Search
     tools.register(QueryAlphaCopilotTool())
@@ -196,8 +335,33 @@ def create_agent() -> AgentLoop:
     tools.register(CheckRecentPostsTool())
     tools.register(GetPlatformStatusTool())
     tools.register(DoneTool())
+    return tools
+
+
+def create_agent() -> AgentLoop:
+    """Create and configure the agent with all tools."""
+    return AgentLoop(LLMClient(), build_tool_registry(), PostEvaluator())
 
-    # Initialize evaluator
-    evaluator = PostEvaluator()
 
-    return AgentLoop(llm, tools, evaluator)
+async def run_many(
+    tasks: List[str],
+    agent_factory: Callable[[], AgentLoop] = create_agent,
+) -> List[str]:
+    """
+    Run several tasks concurrently, one agent per task.
+
+    Args:
+        tasks: Task descriptions
+        agent_factory: Builds a fresh agent for each task
+
+    Closes the genai clients opened on the calling event loop once all tasks
+    are done.
+
+    Returns:
+        Final results in the same order as tasks
+    """
+    agents = [agent_factory() for _ in tasks]
+    try:
+        return list(await asyncio.gather(*(agent.arun(task) for agent, task in zip(agents, tasks))))
+    finally:
+        await close_async_genai_clients()
@@ -2,31 +2,192 @@
 """CLI entry point for the Alpha Copilot Social Agent."""
 
 import argparse
+import asyncio
 import json
 import logging
+import math
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from .config import Config
-from .loop import create_agent
 from .eval import PostEvaluator
 from prompts.system import get_task_prompt
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
+# agent.loop pulls in the genai SDK and every tool's HTTP/platform clients;
+# it is imported only once a run actually starts, so --help and argument
+# errors return immediately
+if TYPE_CHECKING:
+    from .loop import AgentLoop
+
 logger = logging.getLogger(__name__)
 
+# Banner rules for console output
+_BAR50 = "=" * 50
+_BAR70 = "=" * 70
+
+# Markers in the agent's final result that mean the task succeeded
+_SUCCESS_TOKENS = ("TASK_COMPLETE", "SUCCESS")
+
+# Compact JSON for eval output files (stdlib default pads with spaces)
+_JSON_SEPARATORS = (",", ":")
+
+# Default cap on concurrent agent runs in eval mode (provider rate limits)
+MAX_EVAL_WORKERS = 8
+
+# Early-stop defaults: 95% confidence interval on the eval pass rate. A 0.3
+# wide interval takes ~9 scored runs if every run agrees, ~40 at a 50% rate
+_WILSON_Z = 1.96
+DEFAULT_CI_WIDTH = 0.3
+DEFAULT_MIN_RUNS = 3
+
+# Per-thread agent and event loop so eval workers reuse them across runs
+_worker_state = threading.local()
+# Every worker's event loop, closed by _close_worker_loops() after the runs
+_worker_loops: List[asyncio.AbstractEventLoop] = []
+_worker_loops_lock = threading.Lock()
+
+
+def _get_worker_agent() -> "AgentLoop":
+    """Return the calling thread's agent, creating it on first use."""
+    agent = getattr(_worker_state, "agent", None)
+    if agent is None:
+        from .loop import create_agent
+        agent = create_agent()
+        _worker_state.agent = agent
+    return agent
+
+
+def _get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Return the calling thread's event loop, creating it on first use.
+
+    The async genai client is cached per event loop, so keeping one loop per
+    worker lets its runs share one client and connection pool.
+    """
+    loop = getattr(_worker_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _worker_state.loop = loop
+        with _worker_loops_lock:
+            _worker_loops.append(loop)
+    return loop
+
+
+def _close_worker_loops() -> None:
+    """Close the worker event loops and their genai clients once no runs remain."""
+    from .llm import close_async_genai_clients
+
+    with _worker_loops_lock:
+        loops = list(_worker_loops)
+        _worker_loops.clear()
+    for loop in loops:
+        try:
+            loop.run_until_complete(close_async_genai_clients())
+            # Released genai clients schedule their own cleanup task; let it run
+            pending = asyncio.all_tasks(loop)
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        finally:
+            loop.close()
+
+
+@dataclass
+class RunResult:
+    """Outcome of a single eval-mode agent run."""
+    run: int
+    success: bool
+    post_text: Optional[str] = None
+    hookiness: int = 0  # Out of 25
+    quality: int = 0  # Out of 50
+    total: int = 0  # Out of 75
+    passed: bool = False
+    failure_reason: str = ""
+    error: Optional[str] = None
+
+
+def _prewarm() -> None:
+    """Build the shared tool registry and genai client before the first run.
+
+    Every agent reuses these (see agent.loop), so building them once up front
+    keeps their setup cost out of run 1. Per-agent state is left to the
+    workers, which each build and keep their own agent.
+    """
+    from .llm import get_genai_client
+    from .loop import build_tool_registry
+
+    start = time.perf_counter()
+    get_genai_client(Config.GEMINI_API_KEY, Config.LLM_TIMEOUT)
+    build_tool_registry()
+    logger.info("Prewarm complete in %.2fs", time.perf_counter() - start)
+
+
+def _run_single_eval(run_num: int, task: str, evaluator: PostEvaluator) -> RunResult:
+    """Run the agent once and score the generated post."""
+    try:
+        # AgentLoop.arun() calls reset(), so the worker's agent is reusable
+        agent = _get_worker_agent()
+        _get_worker_loop().run_until_complete(agent.arun(task))
+
+        # Get post text from agent's pending_post (stored during write_post evaluation)
+        post_text = agent._pending_post
+
+        # Evaluate the post
+        if not post_text:
+            return RunResult(
+                run=run_num,
+                success=False,
+                error='Could not extract post text from result'
+            )
+
+        # The write_post gate already scored this post; only score it here if it did not
+        eval_result = agent._pending_score or evaluator.evaluate(post_text)
+        return RunResult(
+            run=run_num,
+            success=True,
+            post_text=post_text,
+            hookiness=eval_result.hookiness.total,
+            quality=eval_result.quality.total,
+            total=eval_result.total,
+            passed=eval_result.passed,
+            failure_reason=eval_result.failure_reason
+        )
+
+    except Exception as e:
+        return RunResult(run=run_num, success=False, error=str(e))
+
+
+def _log_run_result(result: RunResult, total_runs: int) -> None:
+    """Log the outcome of a single eval run."""
+    if result.success:
+        logger.info(
+            "Run %d/%d: score %d/75 (%s), hookiness %d/25, quality %d/50",
+            result.run, total_runs, result.total, "PASS" if result.passed else "FAIL",
+            result.hookiness, result.quality,
+        )
+    else:
+        logger.warning("Run %d/%d failed: %s", result.run, total_runs, result.error)
+
+
+def _wilson_interval(passes: int, n: int, z: float = _WILSON_Z) -> Tuple[float, float]:
+    """Return the Wilson score interval (lo, hi) for passes out of n trials."""
+    if n == 0:
+        return 0.0, 1.0
+    p = passes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return center - margin, center + margin
+
 
 def run_eval_mode(args) -> None:
     """Run evaluation mode - generate N posts and score them."""
-    print("=" * 70)
+    print(_BAR70)
     print(f"EVALUATION MODE - Running {args.runs} iterations")
-    print("=" * 70)
+    print(_BAR70)
 
     # Generate task
     if args.task:
@@ -37,135 +198,159 @@ def run_eval_mode(args) -> None:
     print(f"Task: {task}\n")
 
     evaluator = PostEvaluator()
-    results: List[Dict[str, Any]] = []
+
+    # Each run is appended to the NDJSON file as soon as it finishes, so a
+    # crash or Ctrl-C keeps every completed run; the summary is written last
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    results_filename = f"eval_results_{timestamp}.ndjson"
+    summary_filename = f"eval_summary_{timestamp}.json"
 
     # Force dry run using context manager
-    with Config.override(DRY_RUN=True):
-        # Run agent N times
-        for run_num in range(1, args.runs + 1):
-            print(f"\n{'='*70}")
-            print(f"RUN {run_num}/{args.runs}")
-            print('='*70)
-
-            try:
-                agent = create_agent()
-                result = agent.run(task)
-
-                # Get post text from agent's pending_post (stored during write_post evaluation)
-                post_text = agent._pending_post
-
-                # Evaluate the post
-                if post_text:
-                    eval_result = evaluator.evaluate(post_text)
-
-                    results.append({
-                        'run': run_num,
-                        'success': True,
-                        'post_text': post_text,
-                        'hookiness': eval_result.hookiness.total,
-                        'quality': eval_result.quality.total,
-                        'total': eval_result.total,
-                        'passed': eval_result.passed,
-                        'failure_reason': eval_result.failure_reason
-                    })
-
-                    print(f"\n✓ Post generated and evaluated")
-                    print(f"  Score: {eval_result.total}/75 ({'PASS' if eval_result.passed else 'FAIL'})")
-                    print(f"  Hookiness: {eval_result.hookiness.total}/25")
-                    print(f"  Quality: {eval_result.quality.total}/50")
-                else:
-                    results.append({
-                        'run': run_num,
-                        'success': False,
-                        'error': 'Could not extract post text from result'
-                    })
-                    print(f"\n✗ Failed to extract post text")
-
-            except Exception as e:
-                results.append({
-                    'run': run_num,
-                    'success': False,
-                    'error': str(e)
-                })
-                print(f"\n✗ Run failed: {e}")
-
-    # Generate summary report
-    print("\n\n")
-    print("=" * 70)
-    print("EVALUATION REPORT")
-    print("=" * 70)
-
-    successful_runs = [r for r in results if r.get('success', False)]
-    passed_runs = [r for r in successful_runs if r.get('passed', False)]
-
-    print(f"\nSuccessful Runs: {len(successful_runs)}/{args.runs}")
+    with Config.override(DRY_RUN=True), open(results_filename, 'w', buffering=1) as results_file:
+        _prewarm()
+
+        # Runs are independent and I/O-bound on LLM/backend calls, so fan them out
+        max_workers = min(args.runs, args.max_workers or MAX_EVAL_WORKERS)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(_run_single_eval, run_num, task, evaluator)
+                    for run_num in range(1, args.runs + 1)
+                ]
+                # Report each run as soon as it finishes; slot results by run number
+                results: List[Optional[RunResult]] = [None] * args.runs
+                scored = passes = 0
+                stopped = False
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    result = future.result()
+                    results[result.run - 1] = result
+                    results_file.write(json.dumps(asdict(result), separators=_JSON_SEPARATORS) + "\n")
+                    _log_run_result(result, args.runs)
+
+                    if not args.early_stop or stopped or not result.success:
+                        continue
+                    scored += 1
+                    passes += result.passed
+                    lo, hi = _wilson_interval(passes, scored)
+                    if scored >= args.min_runs and hi - lo < args.ci_width:
+                        # Runs already in flight still finish and are recorded
+                        stopped = True
+                        cancelled = sum(f.cancel() for f in futures)
+                        logger.info(
+                            "Early stop after %d scored runs: pass rate CI [%.2f, %.2f], "
+                            "%d queued runs cancelled", scored, lo, hi, cancelled,
+                        )
+        finally:
+            # Workers are done; close their loops and async clients
+            _close_worker_loops()
+
+    results = [r for r in results if r is not None]
+
+    # Tally every summary statistic in a single pass over the runs
+    num_successful = num_passed = 0
+    sum_total = sum_hookiness = sum_quality = 0
+    best = worst = None
+    failed_runs: List[RunResult] = []
+    for r in results:
+        if not r.success:
+            continue
+        num_successful += 1
+        sum_total += r.total
+        sum_hookiness += r.hookiness
+        sum_quality += r.quality
+        if r.passed:
+            num_passed += 1
+        else:
+            failed_runs.append(r)
+        # Strict comparisons keep the earliest run on ties
+        if best is None or r.total > best.total:
+            best = r
+        if worst is None or r.total < worst.total:
+            worst = r
+
+    # Generate summary report, buffered and written in a single call
+    report = [
+        "\n\n",
+        _BAR70,
+        "EVALUATION REPORT",
+        _BAR70,
+        f"\nSuccessful Runs: {num_successful}/{len(results)}",
+    ]
 
     avg_total = 0
     avg_hookiness = 0
     avg_quality = 0
 
-    if successful_runs:
-        print(f"Pass Rate: {len(passed_runs)/len(successful_runs)*100:.1f}% ({len(passed_runs)}/{len(successful_runs)} passed)")
+    if num_successful:
+        report.append(f"Pass Rate: {num_passed/num_successful*100:.1f}% ({num_passed}/{num_successful} passed)")
 
-        avg_total = sum(r['total'] for r in successful_runs) / len(successful_runs)
-        avg_hookiness = sum(r['hookiness'] for r in successful_runs) / len(successful_runs)
-        avg_quality = sum(r['quality'] for r in successful_runs) / len(successful_runs)
+        avg_total = sum_total / num_successful
+        avg_hookiness = sum_hookiness / num_successful
+        avg_quality = sum_quality / num_successful
 
-        print(f"\nAVERAGE SCORES:")
-        print(f"  Total: {avg_total:.1f}/75")
-        print(f"  Hookiness: {avg_hookiness:.1f}/25")
-        print(f"  Quality: {avg_quality:.1f}/50")
+        report.extend([
+            f"\nAVERAGE SCORES:",
+            f"  Total: {avg_total:.1f}/75",
+            f"  Hookiness: {avg_hookiness:.1f}/25",
+            f"  Quality: {avg_quality:.1f}/50",
+        ])
 
         # Best post
-        best = max(successful_runs, key=lambda r: r['total'])
-        print(f"\n{'='*70}")
-        print(f"BEST POST (Run {best['run']}, Score: {best['total']}/75)")
-        print(f"{'='*70}")
-        print(best['post_text'])
+        report.extend([
+            f"\n{_BAR70}",
+            f"BEST POST (Run {best.run}, Score: {best.total}/75)",
+            _BAR70,
+            best.post_text,
+        ])
 
         # Worst post
-        worst = min(successful_runs, key=lambda r: r['total'])
-        print(f"\n{'='*70}")
-        print(f"WORST POST (Run {worst['run']}, Score: {worst['total']}/75)")
-        print(f"{'='*70}")
-        print(worst['post_text'])
+        report.extend([
+            f"\n{_BAR70}",
+            f"WORST POST (Run {worst.run}, Score: {worst.total}/75)",
+            _BAR70,
+            worst.post_text,
+        ])
 
         # Failed posts
-        failed_runs = [r for r in successful_runs if not r.get('passed', False)]
         if failed_runs:
-            print(f"\n{'='*70}")
-            print(f"FAILED POSTS ({len(failed_runs)} total)")
-            print(f"{'='*70}")
+            report.extend([
+                f"\n{_BAR70}",
+                f"FAILED POSTS ({len(failed_runs)} total)",
+                _BAR70,
+            ])
             for r in failed_runs:
-                print(f"\nRun {r['run']} - Score: {r['total']}/75")
-                print(f"Reason: {r['failure_reason']}")
+                report.append(f"\nRun {r.run} - Score: {r.total}/75")
+                report.append(f"Reason: {r.failure_reason}")
 
-    # Save detailed results
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"eval_results_{timestamp}.json"
-    with open(filename, 'w') as f:
+    sys.stdout.write("\n".join(report) + "\n")
+
+    # Save summary next to the per-run results
+    with open(summary_filename, 'w') as f:
         json.dump({
             'timestamp': timestamp,
             'task': task,
-            'runs': args.runs,
-            'results': results,
+            'runs': len(results),
+            'results_file': results_filename,
             'summary': {
-                'successful_runs': len(successful_runs),
-                'passed_runs': len(passed_runs),
-                'pass_rate': len(passed_runs)/len(successful_runs) if successful_runs else 0,
-                'avg_total': avg_total if successful_runs else 0,
-                'avg_hookiness': avg_hookiness if successful_runs else 0,
-                'avg_quality': avg_quality if successful_runs else 0
+                'successful_runs': num_successful,
+                'passed_runs': num_passed,
+                'pass_rate': num_passed/num_successful if num_successful else 0,
+                'avg_total': avg_total,
+                'avg_hookiness': avg_hookiness,
+                'avg_quality': avg_quality
             }
-        }, f, indent=2)
+        }, f, separators=_JSON_SEPARATORS)
 
-    print(f"\n{'='*70}")
-    print(f"Detailed results saved to: {filename}")
-    print('='*70)
+    print(f"\n{_BAR70}")
+    print(f"Per-run results saved to: {results_filename}")
+    print(f"Summary saved to: {summary_filename}")
+    print(_BAR70)
 
 
-def main():
-    """Main entry point."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser."""
     parser = argparse.ArgumentParser(
         description='Alpha Copilot Social Agent - Post options insights to social media',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -178,6 +363,8 @@ Examples:
   python -m agent.main --post morning --dry-run    # Test without posting
   python -m agent.main --task "Post a bullish play for NVDA"
   python -m agent.main --eval --runs 5             # Evaluation mode
+  python -m agent.main --eval --runs 20 --max-workers 4
+  python -m agent.main --eval --runs 50 --early-stop
         """
     )
 
@@ -223,9 +410,51 @@ Examples:
         default=5,
         help='Number of posts to generate in eval mode (default: 5)'
     )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        help=f'Concurrent runs in eval mode (default: {MAX_EVAL_WORKERS})'
+    )
+    parser.add_argument(
+        '--early-stop',
+        action='store_true',
+        help='Stop eval mode once the pass-rate confidence interval is narrow enough'
+    )
+    parser.add_argument(
+        '--ci-width',
+        type=float,
+        default=DEFAULT_CI_WIDTH,
+        help=f'95%% CI width on the pass rate that ends --early-stop (default: {DEFAULT_CI_WIDTH})'
+    )
+    parser.add_argument(
+        '--min-runs',
+        type=int,
+        default=DEFAULT_MIN_RUNS,
+        help=f'Scored runs required before --early-stop can stop (default: {DEFAULT_MIN_RUNS})'
+    )
+    parser.add_argument(
+        '--log-level',
+        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+        default='INFO',
+        help='Logging verbosity (default: INFO)'
+    )
+
+    return parser
 
+
+def main():
+    """Main entry point."""
+    parser = _build_parser()
     args = parser.parse_args()
 
+    # Configure logging here rather than at import, so importing this module
+    # leaves the root logger alone (no-op if the caller already set one up)
+    logging.basicConfig(
+        level=args.log_level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+
     # Validate arguments
     if not args.eval and not args.post and not args.task:
         parser.print_help()
@@ -235,18 +464,38 @@ Examples:
         print("ERROR: --sector is required for sector posts")
         sys.exit(1)
 
-    # Apply dry run override
-    if args.dry_run:
-        Config.DRY_RUN = True
+    if args.runs < 1:
+        print("ERROR: --runs must be at least 1")
+        sys.exit(1)
 
-    # Apply promo override
+    if args.max_workers is not None and args.max_workers < 1:
+        print("ERROR: --max-workers must be at least 1")
+        sys.exit(1)
+
+    if not 0 < args.ci_width <= 1:
+        print("ERROR: --ci-width must be greater than 0 and at most 1")
+        sys.exit(1)
+
+    if args.min_runs < 1:
+        print("ERROR: --min-runs must be at least 1")
+        sys.exit(1)
+
+    # Scope CLI overrides so Config is restored when the run ends
+    overrides = {}
+    if args.dry_run:
+        overrides['DRY_RUN'] = True
     if args.no_promo:
-        Config.ENABLE_PROMO_POST = False
+        overrides['ENABLE_PROMO_POST'] = False
+
+    with Config.override(**overrides):
+        _run(args)
 
-    # Print configuration
-    print("=" * 50)
+
+def _print_config(args: argparse.Namespace) -> None:
+    """Print the effective configuration for this run."""
+    print(_BAR50)
     print("Alpha Copilot Social Agent")
-    print("=" * 50)
+    print(_BAR50)
     print(f"Platform: {args.platform} (cross-post to Twitter + Threads by default)")
     print(f"DRY_RUN: {Config.DRY_RUN}")
     print(f"Promo posts: {Config.ENABLE_PROMO_POST}")
@@ -260,7 +509,12 @@ Examples:
     print(f"LLM Model: {Config.LLM_MODEL}")
     print(f"Twitter configured: {Config.validate_twitter()}")
     print(f"Threads configured: {Config.validate_threads()}")
-    print("=" * 50)
+    print(_BAR50)
+
+
+def _run(args: argparse.Namespace) -> None:
+    """Print configuration, validate it, and run the requested mode."""
+    _print_config(args)
 
     # Validate configuration
     if not Config.validate_alpha_copilot():
@@ -289,29 +543,26 @@ Examples:
         task = get_task_prompt(args.post, args.platform, args.sector)
 
     print(f"Task: {task}")
-    print("=" * 50)
+    print(_BAR50)
 
     # Create and run agent
     try:
+        from .loop import create_agent
         agent = create_agent()
         result = agent.run(task)
 
-        print("=" * 50)
+        print(_BAR50)
         print("Result:")
         print(result)
-        print("=" * 50)
-
-        # Exit with appropriate code
-        if "TASK_COMPLETE" in result or "SUCCESS" in result:
-            sys.exit(0)
-        else:
-            sys.exit(1)
-
+        print(_BAR50)
     except Exception as e:
         logger.exception("Agent failed")
         print(f"ERROR: {e}")
         sys.exit(1)
 
+    # Exit with appropriate code
+    sys.exit(0 if any(token in result for token in _SUCCESS_TOKENS) else 1)
+
 
 if __name__ == "__main__":
     main()
@@ -1,8 +1,10 @@
 """Retry utilities for handling transient failures."""
 
+import asyncio
 import logging
+import random
 import time
-from typing import TypeVar, Callable, Tuple, Type, Union
+from typing import Awaitable, TypeVar, Callable, Optional, Tuple, Type, Union
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,61 @@ DEFAULT_BACKOFF_MULTIPLIER = 2.0
 T = TypeVar('T')
 
 
+class _Backoff:
+    """Delay schedule and give-up rules shared by the sync and async retry helpers."""
+
+    def __init__(
+        self,
+        max_retries: int,
+        initial_delay: float,
+        backoff_multiplier: float,
+        operation_name: str,
+        deadline: Optional[float],
+        jitter: bool,
+        max_delay: Optional[float],
+    ):
+        if max_retries < 1:
+            raise ValueError(f"max_retries must be at least 1, got {max_retries}")
+
+        self.max_retries = max_retries
+        self.initial_delay = initial_delay
+        self.backoff_multiplier = backoff_multiplier
+        self.operation_name = operation_name
+        self.deadline = deadline
+        self.jitter = jitter
+        self.max_delay = max_delay
+        self.delay = initial_delay
+        self.expires_at = time.monotonic() + deadline if deadline is not None else None
+
+    def next_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Return the delay before the next attempt, or None to give up (logged)."""
+        if attempt >= self.max_retries:
+            logger.error("%s failed after %d attempts: %s", self.operation_name, self.max_retries, error)
+            return None
+
+        if self.jitter:
+            self.delay = random.uniform(self.initial_delay, self.delay * self.backoff_multiplier)
+        else:
+            self.delay = self.initial_delay * self.backoff_multiplier ** (attempt - 1)
+        if self.max_delay is not None:
+            self.delay = min(self.delay, self.max_delay)
+        if self.expires_at is not None:
+            remaining = self.expires_at - time.monotonic()
+            if remaining <= 0:
+                logger.error(
+                    "%s failed after %d attempts, %.0fs deadline exceeded: %s",
+                    self.operation_name, attempt, self.deadline, error,
+                )
+                return None
+            self.delay = min(self.delay, remaining)
+
+        logger.warning(
+            "%s failed (attempt %d/%d): %s. Retrying in %.1fs...",
+            self.operation_name, attempt, self.max_retries, error, self.delay,
+        )
+        return self.delay
+
+
 def retry_with_backoff(
     func: Callable[[], T],
     retryable_exceptions: Union[Type[Exception], Tuple[Type[Exception], ...]],
@@ -21,10 +78,17 @@ def retry_with_backoff(
     initial_delay: float = DEFAULT_DELAY_SECONDS,
     backoff_multiplier: float = DEFAULT_BACKOFF_MULTIPLIER,
     operation_name: str = "operation",
+    deadline: Optional[float] = None,
+    jitter: bool = True,
+    max_delay: Optional[float] = None,
 ) -> T:
     """
     Retry a function with exponential backoff on specific exceptions.
 
+    Delays use decorrelated jitter by default (each delay is drawn between
+    initial_delay and backoff_multiplier times the previous one) so concurrent
+    callers don't retry in lockstep.
+
     Args:
         func: The function to call (should take no arguments)
         retryable_exceptions: Exception type(s) to retry on
@@ -32,35 +96,69 @@ def retry_with_backoff(
         initial_delay: Initial delay between retries in seconds
         backoff_multiplier: Multiplier for delay after each retry
         operation_name: Name for logging purposes
+        deadline: Optional overall time budget in seconds, measured from the
+            first attempt. No retry is started once it has run out.
+        jitter: Randomize delays; if False, delays grow as plain
+            initial_delay * backoff_multiplier ** n
+        max_delay: Optional cap on any single delay in seconds
 
     Returns:
         The return value of func
 
     Raises:
+        ValueError: If max_retries is less than 1
         The last exception if all retries fail
     """
-    last_error: Exception = None
-    delay = initial_delay
+    backoff = _Backoff(
+        max_retries, initial_delay, backoff_multiplier, operation_name, deadline, jitter, max_delay
+    )
 
     for attempt in range(1, max_retries + 1):
         try:
             return func()
         except retryable_exceptions as e:
-            last_error = e
-            if attempt < max_retries:
-                logger.warning(
-                    f"{operation_name} failed (attempt {attempt}/{max_retries}): {e}. "
-                    f"Retrying in {delay:.1f}s..."
-                )
-                time.sleep(delay)
-                delay *= backoff_multiplier
-            else:
-                logger.error(f"{operation_name} failed after {max_retries} attempts: {e}")
+            delay = backoff.next_delay(e, attempt)
+            if delay is None:
+                raise
+            time.sleep(delay)
+
+    # Every attempt either returns or raises, so the loop never falls through
+    raise AssertionError("unreachable")
+
+
+async def aretry_with_backoff(
+    func: Callable[[], Awaitable[T]],
+    retryable_exceptions: Union[Type[Exception], Tuple[Type[Exception], ...]],
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    initial_delay: float = DEFAULT_DELAY_SECONDS,
+    backoff_multiplier: float = DEFAULT_BACKOFF_MULTIPLIER,
+    operation_name: str = "operation",
+    deadline: Optional[float] = None,
+    jitter: bool = True,
+    max_delay: Optional[float] = None,
+) -> T:
+    """
+    Async variant of retry_with_backoff().
+
+    func is called to get a fresh awaitable for each attempt, and waits use
+    asyncio.sleep, so many concurrent retries share one event loop thread.
+
+    Raises:
+        ValueError: If max_retries is less than 1
+        The last exception if all retries fail
+    """
+    backoff = _Backoff(
+        max_retries, initial_delay, backoff_multiplier, operation_name, deadline, jitter, max_delay
+    )
+
+    for attempt in range(1, max_retries + 1):
+        try:
+            return await func()
+        except retryable_exceptions as e:
+            delay = backoff.next_delay(e, attempt)
+            if delay is None:
                 raise
-        except Exception:
-            # Don't retry on non-retryable exceptions
-            raise
+            await asyncio.sleep(delay)
 
-    # Should not reach here, but just in case
-    if last_error:
-        raise last_error
+    # Every attempt either returns or raises, so the loop never falls through
+    raise AssertionError("unreachable")
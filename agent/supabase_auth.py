@@ -1,13 +1,41 @@
 """Supabase authentication for Alpha Copilot backend."""
 
+import base64
+import json
 import httpx
 import logging
-from typing import Optional, Tuple
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
 
 from agent.config import Config
+from agent.retry import retry_with_backoff
 
 logger = logging.getLogger(__name__)
 
+# Refresh the access token this many seconds before its JWT expires
+REFRESH_MARGIN_SECONDS = 30
+
+# Token requests retry connection errors, timeouts and 5xx responses
+AUTH_RETRY_INITIAL_DELAY = 0.25  # Seconds
+AUTH_RETRY_MAX_DELAY = 8.0       # Cap on a single wait
+AUTH_RETRY_DEADLINE = 30.0       # Overall budget per token request
+
+
+def _token_expiry(token: str) -> Optional[float]:
+    """Return when a JWT expires on the time.monotonic() clock, or None if unknown.
+
+    Only reads the exp claim; the signature is the backend's to verify.
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        exp = float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Cannot read expiry from Supabase access token, refreshing only on 401: {e}")
+        return None
+    return time.monotonic() + (exp - time.time())
+
 
 class SupabaseAuth:
     """Authenticate with Supabase to get JWT for backend API calls.
@@ -25,6 +53,28 @@ class SupabaseAuth:
         self.password = Config.SUPABASE_PASSWORD
         self._access_token: Optional[str] = None
         self._refresh_token: Optional[str] = None
+        self._expires_at: Optional[float] = None  # time.monotonic() deadline
+        self._lock = threading.Lock()  # One login/refresh at a time in get_access_token
+
+        # Reusable HTTP client so login and refresh share kept-alive connections
+        self._client = httpx.Client(
+            base_url=self.supabase_url,
+            headers={
+                "apikey": self.supabase_anon_key,
+                "Content-Type": "application/json",
+            },
+            timeout=15.0,
+        )
+
+    def close(self) -> None:
+        """Close the HTTP client."""
+        self._client.close()
+
+    def __enter__(self) -> "SupabaseAuth":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def login(self) -> Tuple[bool, str]:
         """Login to Supabase with email/password to get access token."""
@@ -41,23 +91,13 @@ class SupabaseAuth:
             return False, f"Missing credentials: {', '.join(missing)}"
 
         try:
-            response = httpx.post(
-                f"{self.supabase_url}/auth/v1/token?grant_type=password",
-                headers={
-                    "apikey": self.supabase_anon_key,
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "email": self.email,
-                    "password": self.password,
-                },
-                timeout=15.0
-            )
+            response = self._post_token("password", {
+                "email": self.email,
+                "password": self.password,
+            })
 
             if response.status_code == 200:
-                data = response.json()
-                self._access_token = data["access_token"]
-                self._refresh_token = data.get("refresh_token")
+                self._store_tokens(response.json())
                 logger.info("Supabase login successful")
                 return True, "Login successful"
             elif response.status_code == 400:
@@ -76,18 +116,55 @@ class SupabaseAuth:
         except httpx.TimeoutException:
             logger.error("Supabase login timeout")
             return False, "Login timeout"
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Supabase login failed: HTTP {e.response.status_code}")
+            return False, f"Login failed: HTTP {e.response.status_code}"
         except Exception as e:
             logger.exception("Supabase login error")
             return False, f"Login error: {str(e)}"
 
     def get_access_token(self) -> Optional[str]:
-        """Get current access token, login if needed."""
-        if not self._access_token:
-            success, msg = self.login()
+        """Get current access token, logging in or refreshing it shortly before it expires."""
+        with self._lock:
+            if not self._access_token:
+                success, msg = self.login()
+            elif self._expires_at is not None and time.monotonic() + REFRESH_MARGIN_SECONDS >= self._expires_at:
+                success, msg = self.refresh()
+            else:
+                return self._access_token
+
             if not success:
                 logger.error(f"Failed to get access token: {msg}")
                 return None
-        return self._access_token
+            return self._access_token
+
+    def _post_token(self, grant_type: str, payload: Dict[str, Any]) -> httpx.Response:
+        """POST to the token endpoint, retrying transient failures with backoff.
+
+        Raises:
+            httpx.TransportError: If every attempt failed to connect or timed out
+            httpx.HTTPStatusError: If every attempt got a 5xx response
+        """
+        def _do_post() -> httpx.Response:
+            response = self._client.post("/auth/v1/token", params={"grant_type": grant_type}, json=payload)
+            if response.status_code >= 500:
+                response.raise_for_status()
+            return response
+
+        return retry_with_backoff(
+            func=_do_post,
+            retryable_exceptions=(httpx.TransportError, httpx.HTTPStatusError),
+            initial_delay=AUTH_RETRY_INITIAL_DELAY,
+            max_delay=AUTH_RETRY_MAX_DELAY,
+            deadline=AUTH_RETRY_DEADLINE,
+            operation_name=f"Supabase {grant_type} request",
+        )
+
+    def _store_tokens(self, data: Dict[str, Any]) -> None:
+        """Store tokens from a successful token response."""
+        self._access_token = data["access_token"]
+        self._refresh_token = data.get("refresh_token", self._refresh_token)
+        self._expires_at = _token_expiry(self._access_token)
 
     def refresh(self) -> Tuple[bool, str]:
         """Refresh the access token using refresh token."""
@@ -95,20 +172,10 @@ class SupabaseAuth:
             return self.login()
 
         try:
-            response = httpx.post(
-                f"{self.supabase_url}/auth/v1/token?grant_type=refresh_token",
-                headers={
-                    "apikey": self.supabase_anon_key,
-                    "Content-Type": "application/json",
-                },
-                json={"refresh_token": self._refresh_token},
-                timeout=15.0
-            )
+            response = self._post_token("refresh_token", {"refresh_token": self._refresh_token})
 
             if response.status_code == 200:
-                data = response.json()
-                self._access_token = data["access_token"]
-                self._refresh_token = data.get("refresh_token", self._refresh_token)
+                self._store_tokens(response.json())
                 logger.info("Supabase token refreshed")
                 return True, "Token refreshed"
             else:
@@ -124,3 +191,4 @@ class SupabaseAuth:
         """Clear cached tokens (for logout or forced re-auth)."""
         self._access_token = None
         self._refresh_token = None
+        self._expires_at = None
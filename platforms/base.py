@@ -3,12 +3,21 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional
 
+# Marker appended to truncated posts
+_ELLIPSIS = "..."
+
 
 class BasePlatform(ABC):
     """Abstract base class for social media platform adapters."""
 
     name: str
     max_length: int  # Character limit for posts
+    _trunc_limit: int  # Characters kept before _ELLIPSIS; derived from max_length
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "max_length" in cls.__dict__:
+            cls._trunc_limit = cls.max_length - len(_ELLIPSIS)
 
     @abstractmethod
     def publish(self, content: str, reply_to_id: Optional[str] = None) -> Dict[str, Any]:
@@ -51,7 +60,7 @@ class BasePlatform(ABC):
         """Truncate content to platform's max length."""
         if len(content) <= self.max_length:
             return content
-        return content[:self.max_length - 3] + "..."
+        return content[:self._trunc_limit] + _ELLIPSIS
 
     def __repr__(self) -> str:
         return f"<Platform: {self.name} (max {self.max_length} chars)>"
@@ -0,0 +1,43 @@
+"""Tests for agent configuration."""
+
+import pytest
+from agent.config import Config
+
+
+class TestConfigOverride:
+    """Tests for Config.override context manager."""
+
+    def test_override_restores_values(self):
+        """Test that overridden values are restored on exit."""
+        original = Config.MAX_ITERATIONS
+
+        with Config.override(MAX_ITERATIONS=original + 5):
+            assert Config.MAX_ITERATIONS == original + 5
+
+        assert Config.MAX_ITERATIONS == original
+
+    def test_override_restores_on_error(self):
+        """Test that values are restored even if the body raises."""
+        original = Config.DRY_RUN
+
+        with pytest.raises(RuntimeError):
+            with Config.override(DRY_RUN=not original):
+                raise RuntimeError("boom")
+
+        assert Config.DRY_RUN == original
+
+    def test_override_unknown_key_raises(self):
+        """Test that unknown keys are rejected without changing anything."""
+        original = Config.DRY_RUN
+
+        with pytest.raises(ValueError, match="Unknown config key"):
+            with Config.override(DRY_RUN=not original, NOT_A_SETTING=1):
+                pass
+
+        assert Config.DRY_RUN == original
+
+    def test_override_rejects_methods(self):
+        """Test that classmethods cannot be overridden."""
+        with pytest.raises(ValueError, match="Unknown config key"):
+            with Config.override(validate_llm=None):
+                pass
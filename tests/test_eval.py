@@ -1,5 +1,7 @@
 """Tests for the post evaluation system."""
 
+import dataclasses
+
 import pytest
 from agent.eval import PostEvaluator, HookinessScore, QualityScore, UnifiedScore
 
@@ -67,6 +69,14 @@ class TestPostEvaluator:
 
         assert result.total == result.hookiness.total + result.quality.total
 
+    def test_evaluate_matches_standalone_scorers(self):
+        """Test that shared features give the same scores as scoring separately."""
+        post = "Here's the play: $NVDA just broke resistance, up 5% today.\nSell the $950 call?"
+        result = self.evaluator.evaluate(post)
+
+        assert result.hookiness == self.evaluator._score_hookiness_heuristic(post)
+        assert result.quality == self.evaluator._score_quality_heuristic(post)
+
     def test_pass_threshold(self):
         """Test that posts meeting threshold pass."""
         # Good post that should pass
@@ -83,6 +93,32 @@ Here's how to profit:
         # Score should be reasonable (won't always pass but should score decently)
         assert result.total >= 30  # At minimum, should score something
 
+    def test_evaluate_is_memoized_per_thresholds(self):
+        """Test that repeat evaluations are cached until thresholds change."""
+        post = "$NVDA up 5% today! Sell the $950 call for $12. #NFA"
+        first = self.evaluator.evaluate(post)
+        assert self.evaluator.evaluate(post) is first
+
+        self.evaluator.total_min = 75
+        strict = self.evaluator.evaluate(post)
+        assert strict is not first
+        assert not strict.passed
+
+        self.evaluator.cache_clear()
+        assert self.evaluator.evaluate(post) is not strict
+
+    def test_batch_evaluate_preserves_order(self):
+        """Test that batch_evaluate scores each post in input order."""
+        posts = [
+            "NVDA options look good",
+            "$NVDA just hit all-time highs today! Sell the $950 call (Jan 17) for $12 premium",
+            "NVDA options look good",
+        ]
+        results = self.evaluator.batch_evaluate(posts)
+
+        assert [r.total for r in results] == [self.evaluator.evaluate(p).total for p in posts]
+        assert results[1].total > results[0].total
+
     def test_format_report(self):
         """Test that format_report returns a string."""
         post = "$NVDA up 5%! #NFA"
@@ -117,3 +153,16 @@ class TestQualityScore:
         score = evaluator._score_quality_heuristic(post)
 
         assert 5 <= score.total <= 50  # 5 metrics, each 1-10
+
+
+class TestUnifiedScore:
+    """Tests for UnifiedScore dataclass."""
+
+    def test_scores_are_immutable(self):
+        """Test that evaluation results cannot be mutated (they are cached and shared)."""
+        result = PostEvaluator().evaluate("$NVDA up 5% today! #NFA")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.passed = True
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.hookiness.total = 25
@@ -0,0 +1,380 @@
+"""Tests for LLM response parsing."""
+
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from agent.config import Config
+from agent.llm import LLMClient, LLMResponse, _render_prompt_prefix
+
+
+@pytest.fixture
+def client():
+    """LLMClient with a dummy API key (no network calls are made)."""
+    with patch.object(Config, "GEMINI_API_KEY", "test-key"):
+        return LLMClient(enable_grounding=False)
+
+
+class TestParseResponse:
+    """Tests for LLMClient._parse_response."""
+
+    def test_fenced_json_block(self, client):
+        """Test that a ```json block is parsed into a tool call."""
+        text = 'Checking news first.\n```json\n{"tool": "get_market_news", "arguments": {}}\n```'
+        result = client._parse_response(text)
+
+        assert isinstance(result, LLMResponse)
+        assert result.tool_call == {"name": "get_market_news", "arguments": {}}
+        assert result.is_done is False
+
+    def test_done_tool_sets_is_done(self, client):
+        """Test that calling the done tool marks the response as done."""
+        text = '```json\n{"tool": "done", "arguments": {"summary": "Posted"}}\n```'
+        result = client._parse_response(text)
+
+        assert result.is_done is True
+        assert result.tool_call["arguments"] == {"summary": "Posted"}
+
+    def test_inline_json_with_brace_in_string(self, client):
+        """Test that inline JSON is extracted even with braces inside strings."""
+        text = (
+            'I will write the post now: {"tool": "write_post", "arguments": '
+            '{"post_text": "$NVDA {AI rally", "platform": "twitter"}} and then publish.'
+        )
+        result = client._parse_response(text)
+
+        assert result.tool_call["name"] == "write_post"
+        assert result.tool_call["arguments"]["post_text"] == "$NVDA {AI rally"
+        assert result.tool_call["arguments"]["platform"] == "twitter"
+
+    def test_plain_text_has_no_tool_call(self, client):
+        """Test that prose without JSON yields no tool call."""
+        result = client._parse_response("NVDA looks interesting today, let me think.")
+
+        assert result.tool_call is None
+        assert result.is_done is False
+        assert result.reasoning == "NVDA looks interesting today, let me think."
+
+    def test_malformed_json_has_no_tool_call(self, client):
+        """Test that unparseable JSON does not raise."""
+        result = client._parse_response('{"tool": "publish", "arguments": {')
+
+        assert result.tool_call is None
+
+    def test_bare_json_reply(self, client):
+        """Test that a reply consisting only of a JSON object is parsed."""
+        text = '  {"tool": "check_recent_posts", "arguments": {"limit": 5}}\n'
+        result = client._parse_response(text)
+
+        assert result.tool_call == {"name": "check_recent_posts", "arguments": {"limit": 5}}
+        assert result.reasoning == text
+
+    def test_leading_fence_wins_over_later_inline_json(self, client):
+        """Test that a leading ```json block is used even if more JSON follows."""
+        text = (
+            '```json\n{"tool": "get_market_news", "arguments": {}}\n```\n'
+            'Then maybe {"tool": "done", "arguments": {"summary": "x"}}'
+        )
+        result = client._parse_response(text)
+
+        assert result.tool_call["name"] == "get_market_news"
+        assert result.is_done is False
+
+    def test_inline_json_with_spaced_tool_key(self, client):
+        """Test that inline tool calls are found despite whitespace in the opener."""
+        text = 'Done with research. { "tool" : "get_market_news", "arguments": {"limit": 3}}'
+        result = client._parse_response(text)
+
+        assert result.tool_call == {"name": "get_market_news", "arguments": {"limit": 3}}
+
+    def test_json_label_line_with_any_key_order(self, client):
+        """Test that an object after a bare "json" label is parsed whatever its key order."""
+        text = 'Next step:\njson\n{"arguments": {"platform": "twitter"}, "tool": "get_platform_status"}'
+        result = client._parse_response(text)
+
+        assert result.tool_call == {"name": "get_platform_status", "arguments": {"platform": "twitter"}}
+
+    def test_fenced_non_object_is_ignored(self, client):
+        """Test that a fenced JSON value that is not an object does not raise."""
+        result = client._parse_response('Note:\n```json\n["tool"]\n```')
+
+        assert result.tool_call is None
+
+    def test_inline_call_without_string_name_is_ignored(self, client):
+        """Test that inline objects whose tool name is missing or not a string are skipped."""
+        for bad in ('null', '""', '5'):
+            result = client._parse_response(f'Trying {{"tool": {bad}, "arguments": {{}}}} now.')
+            assert result.tool_call is None
+
+        result = client._parse_response('First {"tool": null} then {"tool": "done", "arguments": {}}')
+        assert result.tool_call == {"name": "done", "arguments": {}}
+
+
+class TestBuildPrompt:
+    """Tests for LLMClient._build_prompt_with_tools."""
+
+    TOOLS = [{
+        "name": "write_post",
+        "description": "Draft a post",
+        "parameters": {
+            "properties": {
+                "post_text": {"type": "string", "description": "Post body"},
+                "platform": {"type": "string", "description": "Target platform"},
+            },
+            "required": ["post_text"],
+        },
+    }]
+
+    def test_prompt_layout(self, client):
+        """Test that system, tools and history appear in order."""
+        messages = [
+            {"role": "system", "content": "You are a poster."},
+            {"role": "user", "content": "Post about NVDA"},
+            {"role": "tool", "content": "NVDA up 5%"},
+        ]
+        prompt = client._build_prompt_with_tools(messages, self.TOOLS)
+
+        assert prompt.startswith("You are a poster.\n\n## Tool Calling Format\n")
+        assert "- **write_post**: Draft a post\n  Parameters:\n" in prompt
+        assert "    - post_text (string) (required): Post body\n" in prompt
+        assert "    - platform (string) (optional): Target platform\n" in prompt
+        assert prompt.index("USER: Post about NVDA") < prompt.index("TOOL RESULT:\nNVDA up 5%")
+        assert prompt.endswith("\nASSISTANT: ")
+
+    def test_prefix_rendered_once_across_turns(self, client):
+        """Test that the static prompt prefix is reused as history grows."""
+        messages = [
+            {"role": "system", "content": "Prefix cache test."},
+            {"role": "user", "content": "turn 1"},
+        ]
+        first = client._build_prompt_with_tools(messages, self.TOOLS)
+        hits = _render_prompt_prefix.cache_info().hits
+
+        messages.append({"role": "assistant", "content": "turn 2"})
+        second = client._build_prompt_with_tools(messages, self.TOOLS)
+
+        assert _render_prompt_prefix.cache_info().hits == hits + 1
+        assert second.startswith(first[:first.index("USER:")])
+
+
+class TestExtractGroundingSources:
+    """Tests for LLMClient._extract_grounding_sources."""
+
+    def test_collects_web_sources(self, client):
+        """Test that titled and untitled web chunks are both collected."""
+        from types import SimpleNamespace as NS
+
+        response = NS(candidates=[
+            NS(grounding_metadata=None),
+            NS(grounding_metadata=NS(
+                grounding_chunks=[
+                    NS(web=NS(uri="https://a.example", title="A")),
+                    NS(web=NS(uri="https://b.example", title=None)),
+                    NS(web=None),
+                ],
+                web_search_queries=["nvda news"],
+            )),
+        ])
+
+        assert client._extract_grounding_sources(response) == [
+            "A: https://a.example",
+            "https://b.example",
+        ]
+
+    def test_no_candidates_returns_none(self, client):
+        """Test that responses without candidates yield no sources."""
+        from types import SimpleNamespace as NS
+
+        assert client._extract_grounding_sources(NS(candidates=None)) is None
+
+
+class TestNativeToolCalls:
+    """Tests for the native function-calling path."""
+
+    def test_function_call_becomes_tool_call(self, client):
+        """Test that a function_call part is mapped to LLMResponse."""
+        from types import SimpleNamespace as NS
+
+        call = NS(name="done", args={"summary": "Posted"})
+        response = NS(
+            function_calls=[call],
+            candidates=[NS(
+                content=NS(parts=[NS(text="Wrapping up."), NS(text=None, function_call=call)]),
+                grounding_metadata=None,
+            )],
+        )
+        result = client._parse_function_call(response)
+
+        assert result.reasoning == "Wrapping up."
+        assert result.tool_call == {"name": "done", "arguments": {"summary": "Posted"}}
+        assert result.is_done is True
+
+    def test_text_reply_falls_back(self, client):
+        """Test that replies without a function call are left to the text parser."""
+        from types import SimpleNamespace as NS
+
+        assert client._parse_function_call(NS(function_calls=None)) is None
+
+    def test_native_prompt_omits_tool_instructions(self, client):
+        """Test that the native prompt carries only system text and history."""
+        messages = [
+            {"role": "system", "content": "You are a poster."},
+            {"role": "user", "content": "Post about NVDA"},
+        ]
+        prompt = client._build_native_prompt(messages)
+
+        assert prompt == "You are a poster.\n\n---\n\nUSER: Post about NVDA\n\n\nASSISTANT: "
+
+    def test_native_config_reused_for_same_schemas(self, client):
+        """Test that declarations are converted once per schema list."""
+        tools = TestBuildPrompt.TOOLS
+        config = client._get_native_config(tools)
+
+        assert client._get_native_config(tools) is config
+        assert config.tools[0].function_declarations[0].name == "write_post"
+        assert config.temperature == client._gen_config.temperature
+        assert client._get_native_config(list(tools)) is not config
+
+
+class TestSelectCandidate:
+    """Tests for LLMClient._select_candidate."""
+
+    @staticmethod
+    def _response(*texts):
+        from types import SimpleNamespace as NS
+
+        return NS(candidates=[NS(content=NS(parts=[NS(text=t)])) for t in texts])
+
+    def test_prefers_call_to_registered_tool(self, client):
+        """Test that prose and unknown tools lose to a registered tool call."""
+        response = self._response(
+            "Let me think about this.",
+            '{"tool": "tweet_it", "arguments": {}}',
+            '{"tool": "write_post", "arguments": {"post_text": "hi"}}',
+        )
+        result = client._select_candidate(response, TestBuildPrompt.TOOLS)
+
+        assert result.tool_call == {"name": "write_post", "arguments": {"post_text": "hi"}}
+
+    def test_ties_keep_first_candidate(self, client):
+        """Test that equally ranked candidates resolve to the first."""
+        result = client._select_candidate(self._response("first", "second"), TestBuildPrompt.TOOLS)
+
+        assert result.reasoning == "first"
+
+    def test_no_candidates_raises(self, client):
+        """Test that an empty reply is an error, not a silent empty response."""
+        from types import SimpleNamespace as NS
+
+        with pytest.raises(ValueError, match="no candidates"):
+            client._select_candidate(NS(candidates=[]), TestBuildPrompt.TOOLS)
+
+
+class TestStreaming:
+    """Tests for LLMClient._generate_streaming."""
+
+    @staticmethod
+    def _stream(texts, consumed):
+        from types import SimpleNamespace as NS
+
+        for text in texts:
+            consumed.append(text)
+            yield NS(text=text, candidates=None)
+
+    def _client_with_stream(self, client, texts, consumed):
+        from types import SimpleNamespace as NS
+
+        client.client = NS(models=NS(
+            generate_content_stream=lambda **kwargs: self._stream(texts, consumed)
+        ))
+        return client
+
+    def test_stops_at_complete_tool_call(self, client):
+        """Test that the stream is closed once the fenced call is complete."""
+        texts = ['```json\n{"tool": "done", ', '"arguments": {}}\n```', "\nAnd some filler", " text."]
+        consumed = []
+        client = self._client_with_stream(client, texts, consumed)
+
+        result = client._generate_streaming("prompt", config=None)
+
+        assert result.tool_call == {"name": "done", "arguments": {}}
+        assert result.is_done is True
+        assert consumed == texts[:2]
+
+    def test_falls_back_to_full_parse(self, client):
+        """Test that replies not opening with a tool call are parsed in full."""
+        texts = ["Let me check the news. ", '{"tool": "get_market_news", ', '"arguments": {}}']
+        consumed = []
+        client = self._client_with_stream(client, texts, consumed)
+
+        result = client._generate_streaming("prompt", config=None)
+
+        assert result.tool_call == {"name": "get_market_news", "arguments": {}}
+        assert consumed == texts
+
+
+class TestAgenerate:
+    """Tests for LLMClient.agenerate."""
+
+    @pytest.mark.asyncio
+    async def test_uses_async_client_and_retries_server_errors(self, client):
+        """Test that agenerate awaits the async client and retries transient errors."""
+        from types import SimpleNamespace as NS
+        from google.genai.errors import ServerError
+
+        replies = [
+            ServerError(503, {"error": {"message": "overloaded"}}),
+            NS(text='{"tool": "done", "arguments": {}}', candidates=None, usage_metadata=None),
+        ]
+
+        async def generate_content(**kwargs):
+            reply = replies.pop(0)
+            if isinstance(reply, Exception):
+                raise reply
+            return reply
+
+        async_client = NS(aio=NS(models=NS(generate_content=generate_content)))
+        messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "go"}]
+
+        with patch("agent.retry.asyncio.sleep"), \
+                patch("agent.llm.get_async_genai_client", return_value=async_client):
+            result = await client.agenerate(messages, tools=TestBuildPrompt.TOOLS)
+
+        assert result.is_done is True
+        assert replies == []
+
+
+class TestAsyncGenaiClient:
+    """Tests for get_async_genai_client."""
+
+    def test_one_client_per_event_loop(self):
+        """Test that clients are reused within a loop but never across loops."""
+        from agent.llm import close_async_genai_clients, get_async_genai_client
+
+        async def get_twice():
+            clients = get_async_genai_client("test-key", 60), get_async_genai_client("test-key", 60)
+            await close_async_genai_clients()
+            return clients
+
+        first_a, first_b = asyncio.run(get_twice())
+        second, _ = asyncio.run(get_twice())
+
+        assert first_a is first_b
+        assert second is not first_a
+
+    def test_worker_runs_reuse_client_until_loops_close(self):
+        """Test that eval runs on one worker share a client that is closed at the end."""
+        from agent.llm import get_async_genai_client
+        from agent.main import _close_worker_loops, _get_worker_loop
+
+        async def get_client():
+            return get_async_genai_client("test-key", 60)
+
+        first = _get_worker_loop().run_until_complete(get_client())
+        second = _get_worker_loop().run_until_complete(get_client())
+        assert second is first
+
+        with patch.object(first.aio, "aclose", wraps=first.aio.aclose) as aclose:
+            _close_worker_loops()
+        aclose.assert_awaited_once()
@@ -0,0 +1,214 @@
+"""Tests for the agent loop."""
+
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from agent.config import Config
+from agent.llm import LLMResponse
+from agent.loop import AgentLoop, run_many
+from tools.base import BaseTool
+from tools.registry import ToolRegistry
+from tools.publish import DoneTool
+
+
+class ScriptedLLM:
+    """LLM stand-in that replays a fixed list of responses."""
+
+    def __init__(self, responses, gate=None):
+        self.responses = list(responses)
+        self.gate = gate  # Awaited before each reply, if set
+        self.calls = 0
+        self.prompts = []
+
+    async def agenerate(self, messages, tools):
+        self.calls += 1
+        self.prompts.append(list(messages))
+        if self.gate is not None:
+            await self.gate()
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class EchoTool(BaseTool):
+    """Tool that returns its input."""
+
+    name = "echo"
+    description = "Echo the text back"
+
+    def get_schema(self):
+        return {"name": self.name, "description": self.description, "parameters": {}}
+
+    def execute(self, text=""):
+        return f"ECHO: {text}"
+
+
+def _call(tool, reasoning="Calling a tool", **arguments):
+    return LLMResponse(reasoning=reasoning, tool_call={"name": tool, "arguments": arguments})
+
+
+def _done(summary="Posted"):
+    return LLMResponse(
+        reasoning="All done",
+        tool_call={"name": "done", "arguments": {"summary": summary}},
+        is_done=True,
+    )
+
+
+def _make_agent(llm):
+    tools = ToolRegistry()
+    tools.register(DoneTool())
+    tools.register(EchoTool())
+    return AgentLoop(llm, tools)
+
+
+class TestAgentLoop:
+    """Tests for AgentLoop.run / arun."""
+
+    def test_run_returns_done_result(self):
+        """Test that the sync wrapper drives the async loop to completion."""
+        llm = ScriptedLLM([LLMResponse(reasoning="Thinking..."), _done()])
+        result = _make_agent(llm).run("Post about NVDA")
+
+        assert "Posted" in result
+        assert llm.calls == 2
+
+    def test_run_closes_async_clients(self):
+        """Test that each sync run closes the async clients of its event loop."""
+        llm = ScriptedLLM([_done("first"), _done("second")])
+        agent = _make_agent(llm)
+
+        with patch("agent.loop.close_async_genai_clients") as close:
+            agent.run("Post about NVDA")
+            agent.run("Post about AAPL")
+
+        assert close.await_count == 2
+
+    def test_max_iterations(self):
+        """Test that the loop stops after max_iterations without a done call."""
+        llm = ScriptedLLM([LLMResponse(reasoning=f"step {i}") for i in range(3)])
+        agent = _make_agent(llm)
+        agent.max_iterations = 3
+
+        assert agent.run("Post about NVDA").startswith("MAX_ITERATIONS_REACHED")
+
+    def test_history_is_trimmed_to_window(self):
+        """Test that old turns are replaced by a summary once the window is full."""
+        llm = ScriptedLLM([_call("echo", f"step {i}", text=str(i)) for i in range(5)] + [_done()])
+        agent = _make_agent(llm)
+
+        with Config.override(HISTORY_WINDOW=4):
+            assert "Posted" in agent.run("Post about NVDA")
+
+        last = llm.prompts[-1]
+        assert [m["role"] for m in last] == ["system", "user", "user", "assistant", "tool", "assistant", "tool"]
+        assert last[1]["content"] == "Post about NVDA"
+        assert last[2]["content"] == "SUMMARY: Earlier turns omitted. Tools already called: echo, echo, echo"
+        assert last[-2]["content"].startswith("Called echo: step 4")
+        assert last[-1]["content"] == "ECHO: 4"
+
+    def test_history_trim_keeps_whole_turns(self):
+        """Test that an odd window or a lone error message never splits a call from its result."""
+        llm = ScriptedLLM([
+            _call("echo", "step 0", text="0"),
+            RuntimeError("LLM hiccup"),
+            _call("echo", "step 1", text="1"),
+            _call("echo", "step 2", text="2"),
+            _done(),
+        ])
+
+        with Config.override(HISTORY_WINDOW=3):
+            assert "Posted" in _make_agent(llm).run("Post about NVDA")
+
+        last = llm.prompts[-1]
+        assert [m["role"] for m in last[2:]] == ["user", "assistant", "tool"]
+        assert last[2]["content"].endswith("Tools already called: echo, echo")
+        assert last[-2]["content"].startswith("Called echo: step 2")
+        assert last[-1]["content"] == "ECHO: 2"
+
+    def test_repeated_reply_stops_as_stuck(self):
+        """Test that the loop gives up once the LLM keeps returning the same reply."""
+        llm = ScriptedLLM([_call("echo", "Same again", text="x") for _ in range(5)])
+
+        assert _make_agent(llm).run("Post about NVDA").startswith("STUCK:")
+        assert llm.calls == 3
+
+    def test_consecutive_tool_errors_stop_as_stuck(self):
+        """Test that the loop gives up after repeated failing tool calls."""
+        llm = ScriptedLLM([_call("missing", f"try {i}") for i in range(5)])
+
+        result = _make_agent(llm).run("Post about NVDA")
+
+        assert result.startswith("STUCK: 3 consecutive tool calls failed")
+        assert llm.calls == 3
+
+    def test_distinct_calls_without_reasoning_are_not_stuck(self):
+        """Test that native-style calls with empty reasoning only count as repeats if identical."""
+        llm = ScriptedLLM([_call("echo", "", text=str(i)) for i in range(4)] + [_done()])
+
+        assert "Posted" in _make_agent(llm).run("Post about NVDA")
+        assert llm.calls == 5
+
+    def test_done_is_not_rejected_as_repeat(self):
+        """Test that a done call is honoured even if its reasoning repeats earlier replies."""
+        llm = ScriptedLLM([LLMResponse(reasoning="All done"), LLMResponse(reasoning="All done"), _done()])
+
+        assert "Posted" in _make_agent(llm).run("Post about NVDA")
+
+    def test_agent_reusable_across_runs(self):
+        """Test that a second run starts without the previous run's state."""
+        llm = ScriptedLLM([_done("first"), _done("second")])
+        agent = _make_agent(llm)
+        agent.run("Post about NVDA")
+        agent._pending_post = "stale post"
+
+        assert "second" in agent.run("Post about AAPL")
+        assert agent._pending_post is None
+
+    def test_extract_post_text(self):
+        """Test that the post is cut out between its marker and any suggestions."""
+        agent = _make_agent(ScriptedLLM([]))
+        result = "POST_READY\n\nPOST TEXT:\n$NVDA up 5%!\n\nSUGGESTIONS:\n- add a hook"
+
+        assert agent._extract_post_text(result) == "$NVDA up 5%!"
+        assert agent._extract_post_text("POST TEXT:  just the post ") == "just the post"
+        assert agent._extract_post_text("POST_READY without a post") is None
+
+
+class TestRunMany:
+    """Tests for run_many."""
+
+    @pytest.mark.asyncio
+    async def test_runs_tasks_concurrently_in_order(self):
+        """Test that tasks overlap and results keep task order."""
+        summaries = iter(["first", "second", "third"])
+        started = 0
+        all_started = asyncio.Event()
+
+        async def gate():
+            # Only opens once every task is waiting on its LLM call at the same time
+            nonlocal started
+            started += 1
+            if started == 3:
+                all_started.set()
+            await asyncio.wait_for(all_started.wait(), timeout=5)
+
+        def factory():
+            return _make_agent(ScriptedLLM([_done(next(summaries))], gate=gate))
+
+        results = await run_many(["a", "b", "c"], agent_factory=factory)
+
+        assert [("first" in r, "second" in r, "third" in r) for r in results] == [
+            (True, False, False), (False, True, False), (False, False, True)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_closes_async_clients(self):
+        """Test that the calling loop's async clients are closed after the batch."""
+        with patch("agent.loop.close_async_genai_clients") as close:
+            await run_many(["a"], agent_factory=lambda: _make_agent(ScriptedLLM([_done()])))
+
+        close.assert_awaited_once()
@@ -0,0 +1,36 @@
+"""Tests for the CLI eval mode."""
+
+import time
+from unittest.mock import patch
+
+from agent.main import RunResult, _build_parser, _wilson_interval, run_eval_mode
+
+
+def _passing_run(run_num, task, evaluator):
+    time.sleep(0.02)
+    return RunResult(run=run_num, success=True, post_text="post", total=60, passed=True)
+
+
+class TestEarlyStop:
+    """Tests for --early-stop."""
+
+    def test_wilson_interval(self):
+        """Test the interval against known values."""
+        lo, hi = _wilson_interval(5, 10)
+
+        assert round(lo, 3) == 0.237
+        assert round(hi, 3) == 0.763
+        assert _wilson_interval(0, 0) == (0.0, 1.0)
+
+    def test_stops_early_with_default_settings(self, tmp_path, monkeypatch):
+        """Test that unanimous runs stop well before --runs with the default CI width."""
+        monkeypatch.chdir(tmp_path)
+        args = _build_parser().parse_args(["--eval", "--runs", "100", "--max-workers", "1", "--early-stop"])
+
+        with patch("agent.main._prewarm"), \
+                patch("agent.main._run_single_eval", side_effect=_passing_run) as run_single:
+            run_eval_mode(args)
+
+        assert 9 <= run_single.call_count < 20
+        results = next(tmp_path.glob("eval_results_*.ndjson")).read_text().splitlines()
+        assert len(results) == run_single.call_count
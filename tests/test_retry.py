@@ -0,0 +1,142 @@
+"""Tests for retry utilities."""
+
+import pytest
+from unittest.mock import patch
+
+from agent.retry import aretry_with_backoff, retry_with_backoff
+
+
+class TransientError(Exception):
+    """Retryable test error."""
+
+
+def _failing(times):
+    """Return a callable that raises TransientError `times` times, then returns 'ok'."""
+    calls = {"n": 0}
+
+    def func():
+        calls["n"] += 1
+        if calls["n"] <= times:
+            raise TransientError(f"failure {calls['n']}")
+        return "ok"
+
+    func.calls = calls
+    return func
+
+
+class TestRetryWithBackoff:
+    """Tests for retry_with_backoff."""
+
+    def test_retries_until_success(self):
+        """Test that transient failures are retried."""
+        func = _failing(2)
+        with patch("agent.retry.time.sleep") as sleep:
+            assert retry_with_backoff(func, TransientError, max_retries=3) == "ok"
+
+        assert func.calls["n"] == 3
+        assert sleep.call_count == 2
+
+    def test_raises_after_max_retries(self):
+        """Test that the last error propagates once retries are exhausted."""
+        func = _failing(5)
+        with patch("agent.retry.time.sleep"):
+            with pytest.raises(TransientError, match="failure 3"):
+                retry_with_backoff(func, TransientError, max_retries=3)
+
+    def test_non_retryable_error_is_not_retried(self):
+        """Test that other exceptions propagate immediately."""
+        def func():
+            raise ValueError("bad input")
+
+        with patch("agent.retry.time.sleep") as sleep:
+            with pytest.raises(ValueError):
+                retry_with_backoff(func, TransientError)
+
+        sleep.assert_not_called()
+
+    def test_rejects_zero_retries(self):
+        """Test that max_retries below 1 is an error rather than a silent None."""
+        with pytest.raises(ValueError, match="max_retries"):
+            retry_with_backoff(lambda: "ok", TransientError, max_retries=0)
+
+    def test_jittered_delays_stay_in_bounds(self):
+        """Test that each delay lies between the initial delay and the backoff cap."""
+        func = _failing(4)
+        with patch("agent.retry.time.sleep") as sleep:
+            retry_with_backoff(
+                func, TransientError, max_retries=5, initial_delay=1.0, backoff_multiplier=3.0
+            )
+
+        delays = [call.args[0] for call in sleep.call_args_list]
+        previous = 1.0
+        for delay in delays:
+            assert 1.0 <= delay <= previous * 3.0
+            previous = delay
+
+    def test_no_jitter_uses_plain_exponential_delays(self):
+        """Test that jitter=False gives deterministic exponential delays."""
+        func = _failing(3)
+        with patch("agent.retry.time.sleep") as sleep:
+            retry_with_backoff(func, TransientError, max_retries=4, initial_delay=1.0, jitter=False)
+
+        assert [call.args[0] for call in sleep.call_args_list] == [1.0, 2.0, 4.0]
+
+    def test_max_delay_caps_each_delay(self):
+        """Test that no single delay exceeds max_delay."""
+        func = _failing(3)
+        with patch("agent.retry.time.sleep") as sleep:
+            retry_with_backoff(
+                func, TransientError, max_retries=4, initial_delay=1.0, jitter=False, max_delay=3.0
+            )
+
+        assert [call.args[0] for call in sleep.call_args_list] == [1.0, 2.0, 3.0]
+
+    def test_deadline_stops_retrying(self):
+        """Test that no retry starts once the deadline has passed."""
+        func = _failing(5)
+        with patch("agent.retry.time.sleep") as sleep, \
+                patch("agent.retry.time.monotonic", side_effect=[0.0, 100.0]):
+            with pytest.raises(TransientError, match="failure 1"):
+                retry_with_backoff(func, TransientError, max_retries=5, deadline=10)
+
+        sleep.assert_not_called()
+
+    def test_deadline_clamps_delay(self):
+        """Test that the sleep never overshoots the remaining budget."""
+        func = _failing(1)
+        with patch("agent.retry.time.sleep") as sleep, \
+                patch("agent.retry.time.monotonic", side_effect=[0.0, 9.5]):
+            retry_with_backoff(func, TransientError, initial_delay=2.0, deadline=10)
+
+        assert sleep.call_args.args[0] == pytest.approx(0.5)
+
+
+class TestAretryWithBackoff:
+    """Tests for aretry_with_backoff."""
+
+    @pytest.mark.asyncio
+    async def test_retries_coroutine_until_success(self):
+        """Test that a fresh awaitable is retried with asyncio.sleep between attempts."""
+        func = _failing(2)
+
+        async def call():
+            return func()
+
+        with patch("agent.retry.asyncio.sleep") as sleep, patch("agent.retry.time.sleep") as blocking:
+            result = await aretry_with_backoff(call, TransientError, max_retries=3, jitter=False)
+
+        assert result == "ok"
+        assert [c.args[0] for c in sleep.call_args_list] == [2.0, 4.0]
+        blocking.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_raises_after_max_retries(self):
+        """Test that the last error propagates once retries are exhausted."""
+        func = _failing(5)
+
+        async def call():
+            return func()
+
+        with patch("agent.retry.asyncio.sleep"):
+            with pytest.raises(TransientError, match="failure 2"):
+                await aretry_with_backoff(call, TransientError, max_retries=2)
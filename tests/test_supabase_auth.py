@@ -0,0 +1,118 @@
+"""Tests for Supabase authentication."""
+
+import base64
+import json
+import time
+
+import httpx
+from unittest.mock import patch
+
+from agent.config import Config
+from agent.supabase_auth import SupabaseAuth
+
+SUPABASE_SETTINGS = {
+    "SUPABASE_URL": "https://example.supabase.co",
+    "SUPABASE_ANON_KEY": "anon-key",
+    "SUPABASE_EMAIL": "bot@example.com",
+    "SUPABASE_PASSWORD": "secret",
+}
+
+
+def _jwt(expires_in):
+    """Build an unsigned JWT expiring expires_in seconds from now."""
+    claims = json.dumps({"sub": "bot", "exp": int(time.time()) + expires_in}).encode()
+    return "header." + base64.urlsafe_b64encode(claims).decode().rstrip("=") + ".signature"
+
+
+def _make_auth(handler):
+    """Build a SupabaseAuth whose HTTP client is served by handler."""
+    with Config.override(**SUPABASE_SETTINGS):
+        auth = SupabaseAuth()
+    headers = auth._client.headers
+    auth.close()
+    auth._client = httpx.Client(
+        base_url=auth.supabase_url,
+        headers=headers,
+        transport=httpx.MockTransport(handler),
+    )
+    return auth
+
+
+class TestSupabaseAuth:
+    """Tests for SupabaseAuth login and refresh."""
+
+    def test_login_and_refresh_share_client(self):
+        """Test that login and refresh go through the same client with the anon key."""
+        requests = []
+        tokens = [_jwt(3600), _jwt(3600)]
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"access_token": tokens[len(requests) - 1], "refresh_token": "r"})
+
+        with _make_auth(handler) as auth:
+            assert auth.login() == (True, "Login successful")
+            assert auth.refresh() == (True, "Token refreshed")
+            assert auth.get_access_token() == tokens[1]
+
+        assert [r.url.params["grant_type"] for r in requests] == ["password", "refresh_token"]
+        assert all(r.url.path == "/auth/v1/token" for r in requests)
+        assert all(r.headers["apikey"] == "anon-key" for r in requests)
+        assert auth._client.is_closed
+
+    def test_login_rejected(self):
+        """Test that a 400 from Supabase is reported as invalid credentials."""
+        auth = _make_auth(lambda request: httpx.Response(400, json={"error_description": "bad password"}))
+
+        assert auth.login() == (False, "Invalid credentials: bad password")
+        assert auth.get_access_token() is None
+
+    def test_refreshes_token_before_expiry(self):
+        """Test that a token about to expire is refreshed, and a fresh one is reused."""
+        grants = []
+        tokens = iter([_jwt(10), _jwt(3600)])
+
+        def handler(request):
+            grants.append(request.url.params["grant_type"])
+            return httpx.Response(200, json={"access_token": next(tokens), "refresh_token": "r"})
+
+        auth = _make_auth(handler)
+        expiring = auth.get_access_token()
+        fresh = auth.get_access_token()
+
+        assert fresh != expiring
+        assert auth.get_access_token() == fresh
+        assert grants == ["password", "refresh_token"]
+
+    def test_login_retries_transient_failures(self):
+        """Test that connection errors and 5xx responses are retried before succeeding."""
+        responses = iter([
+            httpx.ConnectError("connection refused"),
+            httpx.Response(503),
+            httpx.Response(200, json={"access_token": _jwt(3600), "refresh_token": "r"}),
+        ])
+
+        def handler(request):
+            response = next(responses)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        with patch("agent.retry.time.sleep") as sleep:
+            assert _make_auth(handler).login() == (True, "Login successful")
+
+        assert sleep.call_count == 2
+        assert all(call.args[0] <= 8.0 for call in sleep.call_args_list)
+
+    def test_login_gives_up_on_persistent_5xx(self):
+        """Test that login reports the status once every retry got a server error."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(502)
+
+        with patch("agent.retry.time.sleep"):
+            assert _make_auth(handler).login() == (False, "Login failed: HTTP 502")
+
+        assert len(calls) == 3
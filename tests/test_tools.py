@@ -43,6 +43,18 @@ class TestToolRegistry:
         assert len(schemas) == 1
         assert schemas[0]["name"] == "write_post"
 
+    def test_get_schemas_cached_until_register(self):
+        """Test that schemas are reused until a new tool is registered."""
+        from tools.publish import DoneTool
+
+        registry = ToolRegistry()
+        registry.register(WritePostTool())
+        schemas = registry.get_schemas()
+        assert registry.get_schemas() is schemas
+
+        registry.register(DoneTool())
+        assert [s["name"] for s in registry.get_schemas()] == ["write_post", "done"]
+
 
 class TestWritePostTool:
     """Tests for WritePostTool class."""
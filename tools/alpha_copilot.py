@@ -35,9 +35,11 @@ class QueryAlphaCopilotTool(BaseTool):
             logger.info("Using static API key for backend API")
 
     def __del__(self):
-        """Clean up HTTP client."""
+        """Clean up HTTP clients."""
         if hasattr(self, '_client'):
             self._client.close()
+        if getattr(self, '_supabase_auth', None):
+            self._supabase_auth.close()
 
     def _get_auth_token(self) -> Optional[str]:
         """Get authentication token (from Supabase or static API key)."""
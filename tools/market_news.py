@@ -3,12 +3,12 @@
 import logging
 from typing import Dict, Any
 
-from google import genai
 from google.genai import types
 from google.genai.errors import ServerError
 
 from .base import BaseTool
 from agent.config import Config
+from agent.llm import get_genai_client
 from agent.retry import retry_with_backoff
 
 logger = logging.getLogger(__name__)
@@ -25,7 +25,7 @@ class GetMarketNewsTool(BaseTool):
     )
 
     def __init__(self):
-        self.client = genai.Client(api_key=Config.GEMINI_API_KEY)
+        self.client = get_genai_client(Config.GEMINI_API_KEY, Config.LLM_TIMEOUT)
         self.model_name = Config.LLM_MODEL
         self.grounding_enabled = Config.ENABLE_GROUNDING
 
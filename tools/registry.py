@@ -1,6 +1,6 @@
 """Tool registry for managing available tools."""
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from .base import BaseTool
 
 
@@ -9,10 +9,12 @@ class ToolRegistry:
 
     def __init__(self):
         self._tools: Dict[str, BaseTool] = {}
+        self._schemas: Optional[List[Dict[str, Any]]] = None  # Rebuilt after register()
 
     def register(self, tool: BaseTool) -> None:
         """Register a tool."""
         self._tools[tool.name] = tool
+        self._schemas = None
 
     def get(self, name: str) -> BaseTool:
         """Get a tool by name."""
@@ -26,8 +28,13 @@ class ToolRegistry:
         return tool.execute(**kwargs)
 
     def get_schemas(self) -> List[Dict[str, Any]]:
-        """Get JSON schemas for all registered tools."""
-        return [tool.get_schema() for tool in self._tools.values()]
+        """Get JSON schemas for all registered tools.
+
+        Built once and shared until another tool is registered; do not mutate.
+        """
+        if self._schemas is None:
+            self._schemas = [tool.get_schema() for tool in self._tools.values()]
+        return self._schemas
 
     def list_tools(self) -> List[str]:
         """List all registered tool names."""